@@ -1,8 +1,44 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import argparse
+import os
 import random
 import math
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing import shared_memory
+
+BLOCK_ELEMENTS = 1 << 20  # distance-matrix entries per chunk, bounds the working memory
+TEXT_CHUNK_ROWS = 100000
+PLOT_SAMPLE = 50000
+INIT_METHODS = ("random", "k-means++", "k-means||")
+ALGORITHMS = ("lloyd", "hamerly", "elkan")
+PARALLEL_ROUNDS = 5
+BATCH_SIZE = 10000
+BACKENDS = ("auto", "brute", "kdtree")
+TREE_LEAF_SIZE = 16
+TREE_QUERY_ROWS = 65536
+TREE_MIN_CLUSTERS = 400  # "auto" picks the KD-tree from this many centroids in 2-D, twice as
+TREE_MAX_DIMS = 6        # many per extra dimension, and never above TREE_MAX_DIMS dimensions
+# Binary dataset: header, then points and centroids as little-endian float rows
+DATASET_MAGIC = b"KMDS"
+DATASET_FORMAT_VERSION = 1
+DATASET_HEADER = struct.Struct("<4sIIIQQ")  # magic, version, dims, item size, points, centroids
+DATASET_HEADER_SIZE = 64                     # data starts 64-byte aligned
+SILHOUETTE_TILE = 1024           # rows and columns per distance tile
+SILHOUETTE_EXACT_LIMIT = 20000   # beyond this, the default silhouette is sampled
+SILHOUETTE_SAMPLE_SIZE = 5000
+SILHOUETTE_REFERENCE_SIZE = 50000  # points the sampled silhouette measures distances against
+
+@dataclass
+class RestartResult:
+    seed: int
+    inertia: float
+    iterations: int
+    seconds: float
 
 class ClusterPoint:
     def __init__(self, x: float, y: float):
@@ -18,8 +54,384 @@ class Cluster:
         self.old_centroid = None
         self.silhouette_score = 0.0
 
+def write_text_dataset(path: str, points: np.ndarray, centroids: np.ndarray):
+    # Same layout as KMeansClusterer.generate_data, formatted a chunk at a time
+    row = ",".join(["%.2f"] * points.shape[1]) + "\n"
+    with open(path, 'w') as f:
+        for title, values in (("Points:", points), ("Centroids:", centroids)):
+            f.write(title + "\n")
+            for start in range(0, len(values), TEXT_CHUNK_ROWS):
+                chunk = values[start:start + TEXT_CHUNK_ROWS]
+                f.write((row * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+def squared_distances(points: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2, clipped at 0 against rounding; float32
+    # inputs are widened first so the expansion keeps its precision
+    points = np.asarray(points, dtype=np.float64)
+    centroids = np.asarray(centroids, dtype=np.float64)
+    distances = points @ centroids.T
+    distances *= -2
+    distances += np.einsum('ij,ij->i', centroids, centroids)
+    distances += np.einsum('ij,ij->i', points, points)[:, None]
+    return np.maximum(distances, 0, out=distances)
+
+class CentroidTree:
+    # KD-tree over the centroids: median splits on the widest dimension, leaves of
+    # TREE_LEAF_SIZE centroids, and each node's bounding box for pruning. Queries run a
+    # whole batch of points through the tree with array operations
+    def __init__(self, centroids: np.ndarray, leaf_size: int = TREE_LEAF_SIZE):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.order = np.arange(len(self.centroids))
+        self.distance_evaluations = 0
+        self.leaf_size = leaf_size
+        self.nodes = []  # (low, high, dim, split, left, right, start, end); root first
+        self.build(0, len(self.centroids))
+        low, high, dim, split, left, right, start, end = zip(*self.nodes)
+        self.low, self.high = np.array(low), np.array(high)
+        self.dim, self.split = np.array(dim), np.array(split)
+        self.left, self.right = np.array(left), np.array(right)
+        self.start, self.end = np.array(start), np.array(end)
+
+    def build(self, start: int, end: int) -> int:
+        node = len(self.nodes)
+        members = self.centroids[self.order[start:end]]
+        low, high = members.min(axis=0), members.max(axis=0)
+        if end - start <= self.leaf_size:
+            self.nodes.append((low, high, 0, 0.0, -1, -1, start, end))
+            return node
+        dim = int(np.argmax(high - low))
+        self.order[start:end] = self.order[start:end][np.argsort(members[:, dim], kind='stable')]
+        middle = (start + end) // 2
+        self.nodes.append(None)
+        left = self.build(start, middle)
+        right = self.build(middle, end)
+        split = self.centroids[self.order[middle - 1], dim]
+        self.nodes[node] = (low, high, dim, split, left, right, start, end)
+        return node
+
+    def query(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        points = np.asarray(points, dtype=np.float64)
+        m = len(points)
+        labels = np.zeros(m, dtype=np.int64)
+        best = np.full(m, np.inf)
+
+        # Descend to each point's own leaf and scan it for a first upper bound
+        node = np.zeros(m, dtype=np.int64)
+        active = np.arange(m)
+        while active.size:
+            inner = self.left[node[active]] >= 0
+            active = active[inner]
+            at = node[active]
+            right = points[active, self.dim[at]] > self.split[at]
+            node[active] = np.where(right, self.right[at], self.left[at])
+        by_leaf = np.argsort(node, kind='stable')
+        leaf_starts = np.flatnonzero(np.r_[True, node[by_leaf][1:] != node[by_leaf][:-1]])
+        for index in np.split(by_leaf, leaf_starts[1:]):
+            self.scan(node[index[0]], index, points, labels, best)
+
+        # Then visit every node whose box could still hold a closer centroid
+        stack = [(0, np.arange(m))]
+        while stack:
+            at, index = stack.pop()
+            gap = np.maximum(self.low[at] - points[index], 0) + np.maximum(points[index] - self.high[at], 0)
+            index = index[np.einsum('ij,ij->i', gap, gap) < best[index]]
+            if not index.size:
+                continue
+            if self.left[at] < 0:
+                index = index[node[index] != at]
+                if index.size:
+                    self.scan(at, index, points, labels, best)
+            else:
+                stack.append((self.right[at], index))
+                stack.append((self.left[at], index))
+        return labels, best
+
+    def scan(self, at: int, index: np.ndarray, points: np.ndarray, labels: np.ndarray, best: np.ndarray):
+        members = self.order[self.start[at]:self.end[at]]
+        distances = squared_distances(points[index], self.centroids[members])
+        self.distance_evaluations += distances.size
+        closest = distances.argmin(axis=1)
+        found = distances[np.arange(len(index)), closest]
+        better = found < best[index]
+        best[index[better]] = found[better]
+        labels[index[better]] = members[closest[better]]
+
+def use_centroid_tree(n_clusters: int, dims: int, backend: str = "auto") -> bool:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {list(BACKENDS)}")
+    if backend == "auto":
+        # Measured break-even against the BLAS scan, which wins for few centroids or
+        # many dimensions
+        return dims <= TREE_MAX_DIMS and n_clusters >= TREE_MIN_CLUSTERS << max(dims - 2, 0)
+    return backend == "kdtree"
+
+def nearest_centroids(data: np.ndarray, centroids: np.ndarray,
+                      backend: str = "auto") -> Tuple[np.ndarray, np.ndarray]:
+    # Labels and squared distances of the nearest centroids, in bounded row chunks,
+    # by brute force or through a KD-tree over the centroids
+    tree = CentroidTree(centroids) if use_centroid_tree(len(centroids), centroids.shape[1], backend) else None
+    step = TREE_QUERY_ROWS if tree else max(1, BLOCK_ELEMENTS // max(len(centroids), 1))
+    labels = np.empty(len(data), dtype=np.int64)
+    nearest = np.empty(len(data))
+    for start in range(0, len(data), step):
+        if tree:
+            labels[start:start + step], nearest[start:start + step] = tree.query(data[start:start + step])
+            continue
+        distances = squared_distances(data[start:start + step], centroids)
+        labels[start:start + step] = distances.argmin(axis=1)
+        nearest[start:start + step] = distances[np.arange(len(distances)), labels[start:start + step]]
+    return labels, nearest
+
+def nearest_squared_distances(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return nearest_centroids(data, centroids)[1]
+
+def iter_text_sections(path: str, chunk_size: int = BATCH_SIZE):
+    # Yields ("Points:" or "Centroids:", rows) for the data.txt layout, at most
+    # chunk_size rows at a time; a file of plain comma-separated rows is all points
+    title = "Points:"
+    with open(path) as f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            start = 0
+            for i, line in enumerate(lines):
+                if line.startswith(("Points:", "Centroids:")):
+                    rows = [row for row in lines[start:i] if row.strip()]
+                    if rows:
+                        yield title, np.loadtxt(rows, delimiter=',', ndmin=2)
+                    title, start = line.strip(), i + 1
+            rows = [row for row in lines[start:] if row.strip()]
+            if rows:
+                yield title, np.loadtxt(rows, delimiter=',', ndmin=2)
+
+def save_dataset(path: str, points: np.ndarray, centroids: Optional[np.ndarray] = None,
+                 dtype=np.float32):
+    # Written in bulk: one header and one tofile per array
+    points = np.asarray(points)
+    dims = points.shape[1]
+    centroids = np.empty((0, dims)) if centroids is None else np.asarray(centroids)
+    dtype = np.dtype(dtype).newbyteorder('<')
+    with open(path, 'wb') as f:
+        f.write(DATASET_HEADER.pack(DATASET_MAGIC, DATASET_FORMAT_VERSION, dims, dtype.itemsize,
+                                    len(points), len(centroids)).ljust(DATASET_HEADER_SIZE, b"\0"))
+        for values in (points, centroids):
+            for start in range(0, len(values), TEXT_CHUNK_ROWS):
+                np.ascontiguousarray(values[start:start + TEXT_CHUNK_ROWS], dtype=dtype).tofile(f)
+
+def is_binary_dataset(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(DATASET_MAGIC)) == DATASET_MAGIC
+
+def load_dataset(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    # Read-only memory maps of the points and centroids; nothing is copied until used
+    with open(path, 'rb') as f:
+        magic, version, dims, itemsize, n_points, n_centroids = DATASET_HEADER.unpack(
+            f.read(DATASET_HEADER.size))
+    if magic != DATASET_MAGIC:
+        raise ValueError(f"{path} is not a k-means dataset file")
+    if version != DATASET_FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {version}, expected {DATASET_FORMAT_VERSION}")
+    dtype = np.dtype(f"<f{itemsize}")
+    points = np.memmap(path, dtype=dtype, mode='r', offset=DATASET_HEADER_SIZE, shape=(n_points, dims))
+    if not n_centroids:
+        return points, np.empty((0, dims), dtype=dtype)
+    centroids = np.memmap(path, dtype=dtype, mode='r', shape=(n_centroids, dims),
+                          offset=DATASET_HEADER_SIZE + n_points * dims * itemsize)
+    return points, centroids
+
+def convert_text_dataset(text_path: str, binary_path: str, dtype=np.float32) -> Tuple[int, int]:
+    # Streams a data.txt-style file into the binary format; the header is written last,
+    # once the point count is known
+    dtype = np.dtype(dtype).newbyteorder('<')
+    n_points, dims, centroids = 0, 0, []
+    with open(binary_path, 'wb') as f:
+        f.write(b"\0" * DATASET_HEADER_SIZE)
+        for title, rows in iter_text_sections(text_path):
+            dims = dims or rows.shape[1]
+            if rows.shape[1] != dims:
+                raise ValueError(f"{text_path} mixes rows of {dims} and {rows.shape[1]} values")
+            if title == "Centroids:":
+                centroids.append(rows)
+            else:
+                rows.astype(dtype).tofile(f)
+                n_points += len(rows)
+        centroids = np.concatenate(centroids) if centroids else np.empty((0, dims))
+        centroids.astype(dtype).tofile(f)
+        f.seek(0)
+        f.write(DATASET_HEADER.pack(DATASET_MAGIC, DATASET_FORMAT_VERSION, dims, dtype.itemsize,
+                                    n_points, len(centroids)))
+    return n_points, len(centroids)
+
+def open_points(path: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    # Points and stored centroids (None if the file has none): memory-mapped for the
+    # binary format and .npy, parsed in chunks for text
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r'), None
+    if is_binary_dataset(path):
+        points, centroids = load_dataset(path)
+        return points, centroids if len(centroids) else None
+    sections = {"Points:": [], "Centroids:": []}
+    for title, rows in iter_text_sections(path):
+        sections[title].append(rows)
+    centroids = np.concatenate(sections["Centroids:"]) if sections["Centroids:"] else None
+    return np.concatenate(sections["Points:"]), centroids
+
+def iter_point_chunks(path: str, chunk_size: int = BATCH_SIZE):
+    # Streams the points of any supported file as float arrays of at most chunk_size rows
+    if path.endswith('.npy') or is_binary_dataset(path):
+        data = open_points(path)[0]
+        for start in range(0, len(data), chunk_size):
+            yield np.array(data[start:start + chunk_size], dtype=np.float64)
+        return
+
+    for title, rows in iter_text_sections(path, chunk_size):
+        if title == "Centroids:":
+            return
+        yield rows
+
+def kmeans_plus_plus(data: np.ndarray, n_clusters: int, rng: np.random.Generator,
+                     weights: Optional[np.ndarray] = None) -> np.ndarray:
+    # D^2 sampling: each next centroid is drawn with probability proportional to its
+    # (weighted) squared distance from the centroids picked so far
+    if len(data) == 0:
+        raise ValueError("k-means++ seeding needs at least one point; use init='random' for empty data")
+    weights = np.ones(len(data)) if weights is None else weights
+    first = np.searchsorted(np.cumsum(weights), rng.uniform(0, weights.sum()), side='right')
+    centroids = [data[min(first, len(data) - 1)]]
+    closest = nearest_squared_distances(data, centroids[0][None])
+    for _ in range(1, n_clusters):
+        scores = np.cumsum(closest * weights)
+        if scores[-1] <= 0:
+            pick = rng.integers(len(data))  # fewer distinct points than clusters
+        else:
+            pick = min(np.searchsorted(scores, rng.uniform(0, scores[-1]), side='right'), len(data) - 1)
+        centroids.append(data[pick])
+        np.minimum(closest, nearest_squared_distances(data, data[pick][None]), out=closest)
+    return np.array(centroids)
+
+def kmeans_parallel(data: np.ndarray, n_clusters: int, rng: np.random.Generator,
+                    rounds: int = PARALLEL_ROUNDS, oversampling: Optional[float] = None) -> np.ndarray:
+    # k-means||: a few passes that each keep every point with probability proportional
+    # to its squared distance (about `oversampling` points per pass), then k-means++ on
+    # the candidates weighted by how many points each one is closest to
+    if len(data) == 0:
+        raise ValueError("k-means|| seeding needs at least one point; use init='random' for empty data")
+    oversampling = oversampling or 2 * n_clusters
+    candidates = data[rng.integers(len(data))][None]
+    closest = nearest_squared_distances(data, candidates)
+    for _ in range(rounds):
+        total = closest.sum()
+        if total <= 0:
+            break
+        picked = data[rng.random(len(data)) < oversampling * closest / total]
+        if len(picked):
+            candidates = np.concatenate([candidates, picked])
+            np.minimum(closest, nearest_squared_distances(data, picked), out=closest)
+
+    step = max(1, BLOCK_ELEMENTS // len(candidates))
+    weights = np.zeros(len(candidates))
+    for start in range(0, len(data), step):
+        nearest = squared_distances(data[start:start + step], candidates).argmin(axis=1)
+        weights += np.bincount(nearest, minlength=len(candidates))
+    return kmeans_plus_plus(candidates, n_clusters, rng, weights)
+
+def seed_centroids(data: np.ndarray, n_clusters: int, init: str, rng: np.random.Generator,
+                   low: Optional[np.ndarray] = None, high: Optional[np.ndarray] = None) -> np.ndarray:
+    if init == "k-means++":
+        return kmeans_plus_plus(data, n_clusters, rng)
+    if init == "k-means||":
+        return kmeans_parallel(data, n_clusters, rng)
+    low = data.min(axis=0) if low is None else low
+    high = data.max(axis=0) if high is None else high
+    return rng.uniform(low, high, size=(n_clusters, data.shape[1]))
+
+def cluster_distance_sums(queries: np.ndarray, data: np.ndarray, labels: np.ndarray,
+                          n_clusters: int) -> np.ndarray:
+    # Sum of distances from each query to the points of every cluster, one tile of
+    # points at a time: each tile is grouped by label and summed with reduceat
+    sums = np.zeros((len(queries), n_clusters))
+    queries = np.asarray(queries, dtype=np.float64)
+    query_norms = np.einsum('ij,ij->i', queries, queries)[:, None]
+    for start in range(0, len(data), SILHOUETTE_TILE):
+        tile = np.asarray(data[start:start + SILHOUETTE_TILE], dtype=np.float64)
+        tile_labels = labels[start:start + SILHOUETTE_TILE]
+        order = np.argsort(tile_labels, kind='stable')
+        tile, tile_labels = tile[order], tile_labels[order]
+        distances = queries @ tile.T
+        distances *= -2
+        distances += query_norms
+        distances += np.einsum('ij,ij->i', tile, tile)
+        np.sqrt(np.maximum(distances, 0, out=distances), out=distances)
+        starts = np.flatnonzero(np.r_[True, tile_labels[1:] != tile_labels[:-1]])
+        sums[:, tile_labels[starts]] += np.add.reduceat(distances, starts, axis=1)
+    return sums
+
+def point_silhouettes(queries: np.ndarray, query_labels: np.ndarray, data: np.ndarray,
+                      labels: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+    # s = (b - a) / max(a, b); points alone in their cluster, or with no other
+    # non-empty cluster to compare against, score 0
+    s = np.zeros(len(queries))
+    n_clusters = len(sizes)
+    for start in range(0, len(queries), SILHOUETTE_TILE):
+        stop = start + SILHOUETTE_TILE
+        own = query_labels[start:stop]
+        sums = cluster_distance_sums(queries[start:stop], data, labels, n_clusters)
+        rows = np.arange(len(own))
+        a = sums[rows, own] / np.maximum(sizes[own] - 1, 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means = sums / sizes
+        means[:, sizes == 0] = np.inf
+        means[rows, own] = np.inf
+        b = means.min(axis=1)
+        valid = (sizes[own] > 1) & np.isfinite(b)
+        s[start:stop][valid] = (b[valid] - a[valid]) / np.maximum(a[valid], b[valid])
+    return s
+
+def exact_silhouette(data: np.ndarray, labels: np.ndarray, n_clusters: int) -> Tuple[np.ndarray, float]:
+    # Per-cluster mean silhouettes and the overall mean over all n^2 distances
+    sizes = np.bincount(labels, minlength=n_clusters)
+    s = point_silhouettes(data, labels, data, labels, sizes)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_cluster = np.nan_to_num(np.bincount(labels, weights=s, minlength=n_clusters) / sizes)
+    return per_cluster, float(s.mean()) if len(s) else 0.0
+
+def sampled_silhouette(data: np.ndarray, labels: np.ndarray, n_clusters: int, sample_size: int,
+                       rng: np.random.Generator, reference_size: int = SILHOUETTE_REFERENCE_SIZE
+                       ) -> Tuple[np.ndarray, float, float, np.ndarray]:
+    # Stratified by cluster with proportional allocation. Sampled points are scored
+    # against a larger stratified reference sample that contains them (all points when
+    # there are at most reference_size). Returns per-cluster means, the overall mean and
+    # the standard errors of both from the sampled points' spread, with the finite
+    # population correction
+    n = len(data)
+    sizes = np.bincount(labels, minlength=n_clusters)
+
+    def allocate(total: int, least: int) -> np.ndarray:
+        return np.minimum(sizes, np.maximum(np.round(total * sizes / n), least).astype(np.int64))
+
+    allocation = allocate(sample_size, 1)
+    references = np.maximum(allocate(reference_size, 2), allocation)
+    members = np.split(np.argsort(labels, kind='stable'), np.cumsum(sizes)[:-1])
+    chosen = [rng.choice(m, size, replace=False) for m, size in zip(members, references)]
+    picked = np.concatenate([c[:size] for c, size in zip(chosen, allocation)])
+    reference = np.concatenate(chosen)
+    s = point_silhouettes(data[picked], labels[picked], data[reference], labels[reference], references)
+
+    strata = labels[picked]
+    taken = np.maximum(allocation, 1)
+    per_cluster = np.bincount(strata, weights=s, minlength=n_clusters) / taken
+    squares = np.bincount(strata, weights=(s - per_cluster[strata]) ** 2, minlength=n_clusters)
+    variance = np.where(allocation > 1, squares / np.maximum(allocation - 1, 1), 0.0)
+    cluster_errors = np.sqrt((1 - allocation / np.maximum(sizes, 1)) * variance / taken)
+    weights = sizes / n
+    return per_cluster, float(weights @ per_cluster), float(np.sqrt(weights ** 2 @ cluster_errors ** 2)), cluster_errors
+
 class KMeansClusterer:
-    def __init__(self, n_points: int = 100, n_clusters: int = 10, max_iterations: int = 100):
+    def __init__(self, n_points: int = 100, n_clusters: int = 10, max_iterations: int = 100,
+                 silhouette_sample: Optional[int] = None, init: str = "random"):
+        if init not in INIT_METHODS:
+            raise ValueError(f"Unknown init {init!r}, expected one of {list(INIT_METHODS)}")
         self.n_points = n_points
         self.n_clusters = n_clusters
         self.max_iterations = max_iterations
@@ -27,6 +439,11 @@ class KMeansClusterer:
         self.clusters: List[Cluster] = []
         self.iteration_count = 0
         self.convergence_threshold = 0.001
+        # None: exact up to SILHOUETTE_EXACT_LIMIT points, sampled above; 0: always exact
+        self.silhouette_sample = silhouette_sample
+        self.mean_silhouette = 0.0
+        self.silhouette_error: Optional[float] = None
+        self.init = init
         self.generate_data()
         
     def generate_data(self):
@@ -41,17 +458,17 @@ class KMeansClusterer:
                 y = max(0, min(100, y))
                 self.points.append(ClusterPoint(x, y))
         
-        for i in range(self.n_clusters):
-            centroid = np.array([random.uniform(0, 100), random.uniform(0, 100)])
-            self.clusters.append(Cluster(centroid, i))
+        if self.init == "random":
+            for i in range(self.n_clusters):
+                centroid = np.array([random.uniform(0, 100), random.uniform(0, 100)])
+                self.clusters.append(Cluster(centroid, i))
+        else:
+            data = np.array([p.coordinates for p in self.points])
+            for i, centroid in enumerate(seed_centroids(data, self.n_clusters, self.init, self.numpy_rng())):
+                self.clusters.append(Cluster(centroid, i))
             
-        with open('data.txt', 'w') as f:
-            f.write("Points:\n")
-            for p in self.points:
-                f.write(f"{p.coordinates[0]:.2f},{p.coordinates[1]:.2f}\n")
-            f.write("Centroids:\n")
-            for c in self.clusters:
-                f.write(f"{c.centroid[0]:.2f},{c.centroid[1]:.2f}\n")
+        write_text_dataset('data.txt', self.point_coordinates(),
+                           np.array([c.centroid for c in self.clusters]).reshape(-1, 2))
 
     def euclidean_distance(self, p1: np.ndarray, p2: np.ndarray) -> float:
         return np.sqrt(np.sum((p1 - p2) ** 2))
@@ -79,27 +496,34 @@ class KMeansClusterer:
         
         return total_movement / self.n_clusters
 
+    def point_coordinates(self) -> np.ndarray:
+        # Shaped explicitly so an empty point list still gives a (0, 2) array
+        return np.array([p.coordinates for p in self.points]).reshape(len(self.points), 2)
+
+    def point_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        labels = np.array([p.cluster_id for p in self.points], dtype=np.int64)
+        return self.point_coordinates(), labels
+
+    def numpy_rng(self) -> np.random.Generator:
+        # Drawn from the random module, so random.seed still makes runs repeatable
+        return np.random.default_rng(random.getrandbits(64))
+
     def calculate_silhouette_score(self):
+        data, labels = self.point_arrays()
+        sample_size = self.silhouette_sample
+        if sample_size is None and len(data) > SILHOUETTE_EXACT_LIMIT:
+            sample_size = SILHOUETTE_SAMPLE_SIZE
+
+        if sample_size and sample_size < len(data):
+            scores, self.mean_silhouette, self.silhouette_error, _ = sampled_silhouette(
+                data, labels, self.n_clusters, sample_size, self.numpy_rng())
+        else:
+            scores, self.mean_silhouette = exact_silhouette(data, labels, self.n_clusters)
+            self.silhouette_error = None
         for cluster in self.clusters:
-            cluster_points = [p for p in self.points if p.cluster_id == cluster.id]
-            if len(cluster_points) <= 1:
-                continue
-                
-            for point in cluster_points:
-                a = np.mean([self.euclidean_distance(point.coordinates, p.coordinates) 
-                           for p in cluster_points if p != point])
-                
-                other_clusters = [c for c in self.clusters if c.id != cluster.id]
-                b = min([np.mean([self.euclidean_distance(point.coordinates, p.coordinates) 
-                                for p in self.points if p.cluster_id == c.id])
-                        for c in other_clusters])
-                
-                point_silhouette = (b - a) / max(a, b)
-                cluster.silhouette_score += point_silhouette
-            
-            cluster.silhouette_score /= len(cluster_points)
+            cluster.silhouette_score = float(scores[cluster.id])
 
-    def run(self):
+    def fit(self):
         while self.iteration_count < self.max_iterations:
             self.iteration_count += 1
             self.assign_points_to_clusters()
@@ -107,11 +531,17 @@ class KMeansClusterer:
             
             if movement < self.convergence_threshold:
                 break
-        
+
+    def run(self, plot: bool = True):
+        self.fit()
         self.calculate_silhouette_score()
-        self.visualize_results()
+        if plot:
+            self.visualize_results()
+        else:
+            self.print_statistics()
 
     def visualize_results(self):
+        import matplotlib.pyplot as plt
         plt.figure(figsize=(12, 8))
         
         colors = plt.cm.rainbow(np.linspace(0, 1, self.n_clusters))
@@ -136,7 +566,18 @@ class KMeansClusterer:
         plt.show()
         plt.close()
 
+        self.print_statistics()
+
+    def print_silhouette(self):
+        if self.silhouette_error is None:
+            print(f"Mean silhouette score: {self.mean_silhouette:.3f}")
+        else:
+            print(f"Mean silhouette score: {self.mean_silhouette:.3f} "
+                  f"(sampled, standard error {self.silhouette_error:.3f})")
+
+    def print_statistics(self):
         print(f"\nClustering completed in {self.iteration_count} iterations")
+        self.print_silhouette()
         print("\nCluster Statistics:")
         for i, cluster in enumerate(self.clusters):
             cluster_points = [p for p in self.points if p.cluster_id == cluster.id]
@@ -145,9 +586,502 @@ class KMeansClusterer:
             print(f"Number of points: {len(cluster_points)}")
             print(f"Silhouette score: {cluster.silhouette_score:.3f}")
 
+def _restart(points: np.ndarray, options: dict, seed: int) -> Tuple[np.ndarray, RestartResult]:
+    started = time.perf_counter()
+    clusterer = VectorizedKMeansClusterer(points=points, seed=seed, **options)
+    clusterer.fit()
+    inertia = clusterer.inertia()
+    result = RestartResult(seed, inertia, clusterer.iteration_count, time.perf_counter() - started)
+    return clusterer.centroids.copy(), result
+
+def _shared_restart(name: str, shape: Tuple[int, int], dtype: str, options: dict,
+                    seed: int) -> Tuple[np.ndarray, RestartResult]:
+    # Runs in a worker process on the parent's shared copy of the points
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return _restart(np.ndarray(shape, dtype=dtype, buffer=block.buf), options, seed)
+    finally:
+        block.close()
+
+class VectorizedKMeansClusterer(KMeansClusterer):
+    # Struct-of-arrays storage: the points are one (n, d) float array with a label
+    # array beside it, and each Lloyd step works through it in bounded chunks.
+    # algorithm="hamerly" or "elkan" keeps distance bounds per point to skip most of
+    # the distance computations once the centroids settle
+    def __init__(self, n_points: int = 100, n_clusters: int = 10, max_iterations: int = 100,
+                 points: Optional[np.ndarray] = None, seed: Optional[int] = None,
+                 silhouette_sample: Optional[int] = None, init: str = "random",
+                 algorithm: str = "lloyd", centroids: Optional[np.ndarray] = None,
+                 n_init: int = 1, workers: Optional[int] = None, backend: str = "auto"):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {list(ALGORITHMS)}")
+        self.algorithm = algorithm
+        use_centroid_tree(n_clusters, 2, backend)  # validates the name
+        self.backend = backend
+        self.rng = np.random.default_rng(seed)
+        # Float arrays, including read-only memory maps, are used as they are
+        self.data = None if points is None else np.asarray(points)
+        if self.data is not None and self.data.dtype.kind != 'f':
+            self.data = self.data.astype(np.float64)
+        self.initial_centroids = centroids
+        self.centroids: np.ndarray = None
+        self.labels: np.ndarray = None
+        # Distance to the assigned centroid; with bounds it is an upper bound that may
+        # be stale after the centroids move
+        self.min_distances: np.ndarray = None
+        self.lower_bounds: np.ndarray = None
+        self.stale: np.ndarray = None
+        self.shifts: np.ndarray = None
+        self.distance_evaluations = 0
+        # n_init > 1 runs independent restarts from different seeds and keeps the one
+        # with the lowest inertia; restarts record every run
+        self.n_init = n_init
+        self.workers = workers
+        self.restarts: List[RestartResult] = []
+        super().__init__(len(self.data) if self.data is not None else n_points, n_clusters, max_iterations,
+                         silhouette_sample, init)
+
+    def generate_data(self):
+        if self.data is None:
+            centers = self.rng.uniform(0, 100, size=(4, 2))
+            points_per_center = self.n_points // 4
+            self.data = np.clip(self.rng.normal(np.repeat(centers, points_per_center, axis=0), 15), 0, 100)
+            self.n_points = len(self.data)
+            self.set_centroids(seed_centroids(self.data, self.n_clusters, self.init, self.rng,
+                                              np.zeros(2), np.full(2, 100.0)))
+            if self.n_points:
+                write_text_dataset('data.txt', self.data, self.centroids)
+        elif self.initial_centroids is not None:
+            self.n_clusters = len(self.initial_centroids)
+            self.set_centroids(self.initial_centroids)
+        else:
+            self.set_centroids(seed_centroids(self.data, self.n_clusters, self.init, self.rng))
+
+    def inertia(self) -> float:
+        # Sum of squared distances from each point to its nearest centroid
+        return float(nearest_centroids(self.data, self.centroids, self.backend)[1].sum())
+
+    def fit(self):
+        if self.n_init <= 1:
+            return super().fit()
+
+        seeds = [int(child.generate_state(1)[0])
+                 for child in np.random.SeedSequence(int(self.rng.integers(2 ** 63))).spawn(self.n_init)]
+        options = dict(n_clusters=self.n_clusters, max_iterations=self.max_iterations, init=self.init,
+                       algorithm=self.algorithm, silhouette_sample=self.silhouette_sample, backend=self.backend)
+        workers = min(self.workers or os.cpu_count() or 1, self.n_init)
+        if workers == 1:
+            runs = [_restart(self.data, options, seed) for seed in seeds]
+        else:
+            # One shared copy of the points for all workers instead of one pickle per task
+            block = shared_memory.SharedMemory(create=True, size=max(self.data.nbytes, 1))
+            try:
+                shared = np.ndarray(self.data.shape, dtype=self.data.dtype, buffer=block.buf)
+                shared[:] = self.data
+                del shared
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    runs = list(pool.map(_shared_restart, [block.name] * len(seeds),
+                                         [self.data.shape] * len(seeds), [self.data.dtype.str] * len(seeds),
+                                         [options] * len(seeds), seeds))
+            finally:
+                block.close()
+                block.unlink()
+
+        self.restarts = [result for _, result in runs]
+        best = min(range(len(runs)), key=lambda i: runs[i][1].inertia)
+        self.set_centroids(runs[best][0])
+        self.assign_all()
+        self.iteration_count = runs[best][1].iterations
+
+    def set_centroids(self, centroids: np.ndarray):
+        # Cluster.centroid is a view of its row, so in-place updates show up there too
+        self.centroids = np.array(centroids, dtype=np.float64)
+        self.clusters = [Cluster(self.centroids[i], i) for i in range(self.n_clusters)]
+        self.labels = np.zeros(self.n_points, dtype=np.int32)
+        self.min_distances = np.full(self.n_points, np.inf)
+        self.lower_bounds = None
+        self.shifts = None
+
+    def chunk_rows(self) -> int:
+        return max(1, BLOCK_ELEMENTS // max(self.n_clusters, 1))
+
+    def assign_points_to_clusters(self):
+        if self.algorithm == "lloyd" or self.lower_bounds is None:
+            self.assign_all()
+        elif self.algorithm == "hamerly":
+            self.assign_hamerly()
+        else:
+            self.assign_elkan()
+
+    def assign_all(self):
+        # Full scan, a chunk of rows at a time; also sets up the bounds for later passes.
+        # Plain Lloyd steps with many centroids query a KD-tree instead (the bounded
+        # algorithms need distances to more than the nearest centroid)
+        if self.algorithm == "lloyd" and use_centroid_tree(self.n_clusters, self.centroids.shape[1], self.backend):
+            tree = CentroidTree(self.centroids)
+            for start in range(0, self.n_points, TREE_QUERY_ROWS):
+                labels, nearest = tree.query(self.data[start:start + TREE_QUERY_ROWS])
+                self.labels[start:start + TREE_QUERY_ROWS] = labels
+                self.min_distances[start:start + TREE_QUERY_ROWS] = np.sqrt(nearest)
+            self.distance_evaluations += tree.distance_evaluations
+            return
+
+        step = self.chunk_rows()
+        if self.algorithm == "hamerly":
+            self.lower_bounds = np.empty(self.n_points)
+        elif self.algorithm == "elkan":
+            self.lower_bounds = np.empty((self.n_points, self.n_clusters))
+            self.stale = np.zeros(self.n_points, dtype=bool)
+        for start in range(0, self.n_points, step):
+            distances = squared_distances(self.data[start:start + step], self.centroids)
+            labels = distances.argmin(axis=1)
+            self.labels[start:start + step] = labels
+            self.min_distances[start:start + step] = np.sqrt(distances[np.arange(len(labels)), labels])
+            if self.algorithm == "hamerly":
+                self.lower_bounds[start:start + step] = self.second_nearest(distances)
+            elif self.algorithm == "elkan":
+                self.lower_bounds[start:start + step] = np.sqrt(distances)
+        self.distance_evaluations += self.n_points * self.n_clusters
+
+    def second_nearest(self, squared: np.ndarray) -> np.ndarray:
+        if self.n_clusters < 2:
+            return np.full(len(squared), np.inf)
+        return np.sqrt(np.partition(squared, 1, axis=1)[:, 1])
+
+    def centroid_separation(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Pairwise centroid distances, and half the distance from each centroid to its
+        # nearest neighbour: a point closer than that to its centroid cannot move
+        gaps = np.sqrt(squared_distances(self.centroids, self.centroids))
+        np.fill_diagonal(gaps, np.inf)
+        self.distance_evaluations += self.n_clusters * (self.n_clusters - 1) // 2
+        return gaps, gaps.min(axis=1) / 2
+
+    def exact_distances(self, index: np.ndarray, centroid_index: np.ndarray) -> np.ndarray:
+        self.distance_evaluations += len(index)
+        return np.sqrt(((self.data[index] - self.centroids[centroid_index]) ** 2).sum(axis=1))
+
+    def assign_hamerly(self):
+        # One upper bound (distance to the own centroid) and one lower bound (distance
+        # to the second nearest) per point; moves loosen both by the centroid shifts
+        shifts, self.shifts = self.shifts, np.zeros(self.n_clusters)
+        self.min_distances += shifts[self.labels]
+        order = np.argsort(shifts)
+        largest = shifts[order[-1]]
+        runner_up = shifts[order[-2]] if self.n_clusters > 1 else 0.0
+        self.lower_bounds -= np.where(self.labels == order[-1], runner_up, largest)
+
+        _, half_gap = self.centroid_separation()
+        bound = np.maximum(half_gap[self.labels], self.lower_bounds)
+        candidates = np.flatnonzero(self.min_distances > bound)
+        self.min_distances[candidates] = self.exact_distances(candidates, self.labels[candidates])
+        candidates = candidates[self.min_distances[candidates] > bound[candidates]]
+
+        step = self.chunk_rows()
+        for start in range(0, len(candidates), step):
+            index = candidates[start:start + step]
+            distances = squared_distances(self.data[index], self.centroids)
+            labels = distances.argmin(axis=1)
+            self.labels[index] = labels
+            self.min_distances[index] = np.sqrt(distances[np.arange(len(index)), labels])
+            self.lower_bounds[index] = self.second_nearest(distances)
+        self.distance_evaluations += len(candidates) * self.n_clusters
+
+    def assign_elkan(self):
+        # One lower bound per point and centroid; a centroid is only measured when
+        # neither its lower bound nor half its distance to the current centroid rules
+        # it out
+        shifts, self.shifts = self.shifts, np.zeros(self.n_clusters)
+        self.min_distances += shifts[self.labels]
+        self.lower_bounds -= shifts
+        np.maximum(self.lower_bounds, 0, out=self.lower_bounds)
+        self.stale[:] = True
+
+        gaps, half_gap = self.centroid_separation()
+        candidates = np.flatnonzero(self.min_distances > half_gap[self.labels])
+        step = self.chunk_rows()
+        for start in range(0, len(candidates), step):
+            index = candidates[start:start + step]
+            labels = self.labels[index]
+            upper = self.min_distances[index]
+            lower = self.lower_bounds[index]
+            rows = np.arange(len(index))
+
+            def open_pairs():
+                pairs = (upper[:, None] > lower) & (upper[:, None] > gaps[labels] / 2)
+                pairs[rows, labels] = False
+                return pairs
+
+            # Tighten stale upper bounds only where some centroid is still in play
+            tighten = open_pairs().any(axis=1) & self.stale[index]
+            upper[tighten] = self.exact_distances(index[tighten], labels[tighten])
+            lower[tighten, labels[tighten]] = upper[tighten]
+            self.stale[index[tighten]] = False
+
+            pair_rows, pair_cols = np.nonzero(open_pairs())
+            distances = self.exact_distances(index[pair_rows], pair_cols)
+            lower[pair_rows, pair_cols] = distances
+            best = np.full(lower.shape, np.inf)
+            best[pair_rows, pair_cols] = distances
+            best[rows, labels] = upper
+            labels = best.argmin(axis=1)
+
+            self.labels[index] = labels
+            self.min_distances[index] = best[rows, labels]
+            self.lower_bounds[index] = lower
+
+    def cluster_sums(self) -> Tuple[np.ndarray, np.ndarray]:
+        k, d = self.centroids.shape
+        counts = np.zeros(k, dtype=np.int64)
+        sums = np.zeros((k, d))
+        step = self.chunk_rows()
+        for start in range(0, self.n_points, step):
+            labels = self.labels[start:start + step]
+            rows = self.data[start:start + step]
+            counts += np.bincount(labels, minlength=k)
+            if d <= 8:
+                # A weighted bincount per column is much faster than np.add.at in low dimensions
+                for j in range(d):
+                    sums[:, j] += np.bincount(labels, weights=rows[:, j], minlength=k)
+            else:
+                np.add.at(sums, labels, rows)
+        return counts, sums
+
+    def update_centroids(self) -> float:
+        counts, sums = self.cluster_sums()
+        filled = counts > 0
+        new_centroids = sums[filled] / counts[filled, None]
+        self.shifts = np.zeros(self.n_clusters)
+        self.shifts[filled] = np.sqrt(((new_centroids - self.centroids[filled]) ** 2).sum(axis=1))
+        movement = self.shifts.sum()
+        self.centroids[filled] = new_centroids
+        return movement / self.n_clusters
+
+    def cluster_sizes(self) -> np.ndarray:
+        return np.bincount(self.labels, minlength=self.n_clusters)
+
+    def point_coordinates(self) -> np.ndarray:
+        return self.data
+
+    def point_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.data, self.labels
+
+    def numpy_rng(self) -> np.random.Generator:
+        return self.rng
+
+    def visualize_results(self):
+        import matplotlib.pyplot as plt
+        plt.figure(figsize=(12, 8))
+
+        # A fixed random subset keeps the scatter fast for big datasets
+        shown = np.arange(self.n_points)
+        if self.n_points > PLOT_SAMPLE:
+            shown = np.sort(self.rng.choice(self.n_points, PLOT_SAMPLE, replace=False))
+        colors = plt.cm.rainbow(np.linspace(0, 1, self.n_clusters))
+        points, labels = self.data[shown], self.labels[shown]
+        for i in range(self.n_clusters):
+            members = points[labels == i]
+            if len(members):
+                plt.scatter(members[:, 0], members[:, 1], c=[colors[i]], label=f'Cluster {i+1}', alpha=0.6)
+        plt.scatter(self.centroids[:, 0], self.centroids[:, 1], c=colors, marker='*', s=200, edgecolor='black')
+
+        plt.title('K-Means Clustering Results')
+        plt.xlabel('X')
+        plt.ylabel('Y')
+        plt.legend()
+        plt.grid(True)
+
+        plt.savefig('output/clustering_result.png')
+        plt.show()
+        plt.close()
+
+        self.print_statistics()
+
+    def print_statistics(self):
+        print(f"\nClustering completed in {self.iteration_count} iterations")
+        if self.restarts:
+            best = min(self.restarts, key=lambda r: r.inertia)
+            print(f"Best of {len(self.restarts)} restarts (inertia {best.inertia:.2f}, seed {best.seed})")
+            for i, r in enumerate(self.restarts):
+                print(f"  restart {i+1}: inertia {r.inertia:.2f}, {r.iterations} iterations, {r.seconds:.2f} s")
+        else:
+            print(f"Distance evaluations: {self.distance_evaluations}")
+        self.print_silhouette()
+        print("\nCluster Statistics:")
+        sizes = self.cluster_sizes()
+        for i, cluster in enumerate(self.clusters):
+            print(f"\nCluster {i+1}:")
+            print(f"Centroid: ({cluster.centroid[0]:.2f}, {cluster.centroid[1]:.2f})")
+            print(f"Number of points: {sizes[i]}")
+            print(f"Silhouette score: {cluster.silhouette_score:.3f}")
+
+class MiniBatchKMeansClusterer:
+    # Streaming k-means: points arrive in batches (from partial_fit or a file) and are
+    # never all held in memory. Each centroid is the running mean of the points ever
+    # assigned to it, i.e. it moves towards a new point with learning rate 1/count
+    def __init__(self, n_clusters: int = 10, batch_size: int = BATCH_SIZE, init: str = "k-means++",
+                 seed: Optional[int] = None):
+        if init not in INIT_METHODS:
+            raise ValueError(f"Unknown init {init!r}, expected one of {list(INIT_METHODS)}")
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.init = init
+        self.rng = np.random.default_rng(seed)
+        self.centroids: np.ndarray = None
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.iteration_count = 0
+        self.points_seen = 0
+        self.convergence_threshold = 0.001
+        self.pending: List[np.ndarray] = []
+        self.sizes: np.ndarray = None
+        self.inertia: Optional[float] = None
+
+    def partial_fit(self, points: np.ndarray) -> "MiniBatchKMeansClusterer":
+        points = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+        if self.centroids is None:
+            # Hold back batches until there are enough points to seed from
+            self.pending.append(points)
+            if sum(len(p) for p in self.pending) < self.n_clusters:
+                return self
+            points = np.concatenate(self.pending)
+            self.pending = []
+            self.centroids = seed_centroids(points, self.n_clusters, self.init, self.rng)
+
+        for start in range(0, len(points), self.batch_size):
+            self.update(points[start:start + self.batch_size])
+        return self
+
+    def update(self, batch: np.ndarray) -> float:
+        labels, _ = nearest_centroids(batch, self.centroids)
+        batch_counts = np.bincount(labels, minlength=self.n_clusters)
+        sums = np.zeros_like(self.centroids)
+        for j in range(batch.shape[1]):
+            sums[:, j] = np.bincount(labels, weights=batch[:, j], minlength=self.n_clusters)
+
+        # c += (sum - b * c) / (v + b): the per-point 1/v steps applied to the whole batch
+        filled = batch_counts > 0
+        self.counts += batch_counts
+        step = (sums[filled] - batch_counts[filled, None] * self.centroids[filled]) / self.counts[filled, None]
+        self.centroids[filled] += step
+        self.iteration_count += 1
+        self.points_seen += len(batch)
+        return float(np.sqrt((step ** 2).sum(axis=1)).sum() / self.n_clusters)
+
+    def fit_file(self, path: str, epochs: int = 1) -> "MiniBatchKMeansClusterer":
+        # Later epochs re-read the file; stop early once an epoch barely moves the centroids
+        for _ in range(epochs):
+            before = None if self.centroids is None else self.centroids.copy()
+            for chunk in iter_point_chunks(path, self.batch_size):
+                self.partial_fit(chunk)
+            if self.pending:
+                self.flush()
+            if before is not None and np.sqrt(((self.centroids - before) ** 2).sum(axis=1)).mean() \
+                    < self.convergence_threshold:
+                break
+        return self
+
+    def flush(self):
+        # Seed from whatever was held back, even if it is fewer than n_clusters points
+        points = np.concatenate(self.pending)
+        self.pending = []
+        self.centroids = seed_centroids(points, min(self.n_clusters, len(points)), self.init, self.rng)
+        if len(self.centroids) < self.n_clusters:
+            extra = self.rng.choice(len(points), self.n_clusters - len(self.centroids))
+            self.centroids = np.concatenate([self.centroids, points[extra]])
+        self.update(points)
+
+    def predict(self, points: np.ndarray) -> np.ndarray:
+        return nearest_centroids(np.asarray(points, dtype=np.float64), self.centroids)[0]
+
+    def score_file(self, path: str) -> Tuple[np.ndarray, float]:
+        # One more streaming pass for the final cluster sizes and inertia
+        sizes = np.zeros(self.n_clusters, dtype=np.int64)
+        inertia = 0.0
+        for chunk in iter_point_chunks(path, self.batch_size):
+            labels, nearest = nearest_centroids(chunk, self.centroids)
+            sizes += np.bincount(labels, minlength=self.n_clusters)
+            inertia += nearest.sum()
+        self.sizes, self.inertia = sizes, inertia
+        return sizes, inertia
+
+    def print_statistics(self):
+        print(f"\nClustering completed in {self.iteration_count} mini-batches over {self.points_seen} points")
+        if self.inertia is not None:
+            print(f"Inertia: {self.inertia:.2f}")
+        print("\nCluster Statistics:")
+        for i, centroid in enumerate(self.centroids):
+            print(f"\nCluster {i+1}:")
+            print(f"Centroid: ({centroid[0]:.2f}, {centroid[1]:.2f})" if len(centroid) > 1
+                  else f"Centroid: ({centroid[0]:.2f})")
+            if self.sizes is not None:
+                print(f"Number of points: {self.sizes[i]}")
+
 def main():
-    clusterer = KMeansClusterer(n_points=100, n_clusters=10)
-    clusterer.run()
+    parser = argparse.ArgumentParser(description="K-Means clustering")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="print cluster statistics only, without importing matplotlib")
+    parser.add_argument("--n-points", type=int, default=100)
+    parser.add_argument("--n-clusters", type=int, default=10)
+    parser.add_argument("--engine", choices=["objects", "numpy", "minibatch"], default="objects",
+                        help="ClusterPoint objects, one point array with chunked NumPy Lloyd steps, or "
+                             "mini-batches streamed from --input")
+    parser.add_argument("--input", default="data.txt",
+                        help="point file for the minibatch engine: data.txt layout, CSV rows or .npy")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="nearest-centroid search of the numpy engine's Lloyd steps: brute force, a KD-tree "
+                             "over the centroids, or picked from the cluster count and dimensions")
+    parser.add_argument("--n-init", type=int, default=1,
+                        help="independent restarts of the numpy engine; the lowest inertia wins")
+    parser.add_argument("--workers", type=int, help="processes for the restarts (default: CPU count)")
+    parser.add_argument("--dataset", help="cluster this file with the numpy engine instead of generated points; "
+                                          "its stored centroids, if any, are the starting centroids")
+    parser.add_argument("--save-dataset", help="also write the generated points to this binary dataset file")
+    parser.add_argument("--convert", nargs=2, metavar=("TEXT", "BINARY"),
+                        help="convert a data.txt-style file to the binary dataset format and exit")
+    parser.add_argument("--epochs", type=int, default=1, help="passes of the minibatch engine over --input")
+    parser.add_argument("--seed", type=int, help="random seed for the numpy engine")
+    parser.add_argument("--init", choices=INIT_METHODS,
+                        help="initial centroids: uniform at random, k-means++ or k-means|| "
+                             "(default: random, k-means++ for the minibatch engine)")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="lloyd",
+                        help="assignment step of the numpy engine: full scan, or Hamerly/Elkan bounds")
+    parser.add_argument("--silhouette-sample", type=int,
+                        help=f"points in the stratified silhouette sample, 0 for exact (default: exact up to "
+                             f"{SILHOUETTE_EXACT_LIMIT} points, else {SILHOUETTE_SAMPLE_SIZE})")
+    args = parser.parse_args()
+    if args.convert:
+        n_points, n_centroids = convert_text_dataset(*args.convert)
+        print(f"Wrote {n_points} points and {n_centroids} centroids to {args.convert[1]}")
+        return
+    if args.algorithm != "lloyd" and args.engine != "numpy":
+        parser.error("--algorithm needs --engine numpy")
+    if args.n_init > 1 and args.engine != "numpy":
+        parser.error("--n-init needs --engine numpy")
+    if args.dataset and args.engine != "numpy":
+        parser.error("--dataset needs --engine numpy (the minibatch engine reads --input)")
+
+    if args.engine == "minibatch":
+        streamer = MiniBatchKMeansClusterer(n_clusters=args.n_clusters, batch_size=args.batch_size,
+                                            init=args.init or "k-means++",
+                                            seed=args.seed)
+        streamer.fit_file(args.input, epochs=args.epochs)
+        streamer.score_file(args.input)
+        streamer.print_statistics()
+        return
+    if args.engine == "numpy":
+        points, centroids = open_points(args.dataset) if args.dataset else (None, None)
+        clusterer = VectorizedKMeansClusterer(n_points=args.n_points, n_clusters=args.n_clusters, seed=args.seed,
+                                              silhouette_sample=args.silhouette_sample, init=args.init or "random",
+                                              algorithm=args.algorithm, points=points,
+                                              centroids=None if args.init or args.n_init > 1 else centroids,
+                                              n_init=args.n_init, workers=args.workers, backend=args.backend)
+    else:
+        clusterer = KMeansClusterer(n_points=args.n_points, n_clusters=args.n_clusters,
+                                    silhouette_sample=args.silhouette_sample, init=args.init or "random")
+    if args.save_dataset:
+        save_dataset(args.save_dataset, clusterer.point_coordinates(),
+                     np.array([c.centroid for c in clusterer.clusters]))
+    clusterer.run(plot=not args.no_plot)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,51 +1,348 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import argparse
+import csv
+import json
+import multiprocessing
+import os
 import random
+import struct
+import time
+import heapq
+from array import array
+from collections import Counter
 from dataclasses import dataclass
-from copy import deepcopy
+from itertools import chain
+from operator import attrgetter
 
 @dataclass
 class Queen:
     row: int
     col: int
 
+CROSSOVER_OPERATORS = {"order": "order_crossover", "pmx": "pmx_crossover", "cycle": "cycle_crossover"}
+
+# Checkpoint layout, all little-endian: header, Mersenne Twister state (625 uint32
+# words), population rows and best rows as int32, in that order
+CHECKPOINT_MAGIC = b"NQGA"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_HEADER = struct.Struct("<4sIIIqqBd")
+METRIC_FIELDS = ("generation", "best", "mean", "diversity", "evals_per_sec")
+DIVERSITY_SAMPLE = 32
+OUTPUT_DIR = "output"
+BOARD_RENDER_LIMIT = 64     # larger boards are drawn as a downsampled queen-density image
+QUEEN_SCATTER_LIMIT = 200000  # above this, only the density image is drawn
+MEMETIC_MAX_CELLS = 10 ** 7   # CLI cap on population_size * board_size for the memetic engine
+
+def conflict_pairs(counts: Counter) -> int:
+    return sum(k * (k - 1) // 2 for k in counts.values())
+
+def greedy_rows(n: int, rng: random.Random, tries: int = 50) -> List[int]:
+    # Column by column, swap in a random unused row that is free on both diagonals;
+    # almost every column succeeds, so only a few conflicts are left for repair
+    rows = list(range(n))
+    offset = n - 1
+    diagonals = [0] * (2 * n - 1)
+    anti_diagonals = [0] * (2 * n - 1)
+    uniform = rng.random  # much cheaper than randrange in this hot loop
+    for i in range(n):
+        span = n - i
+        for _ in range(tries):
+            j = i + int(uniform() * span)
+            row = rows[j]
+            d, a = row - i + offset, row + i
+            if not (diagonals[d] or anti_diagonals[a]):
+                break
+        rows[j] = rows[i]
+        rows[i] = row
+        diagonals[d] += 1
+        anti_diagonals[a] += 1
+    return rows
+
+def min_conflicts_repair(rows: List[int], max_steps: int, rng: random.Random) -> int:
+    # Swap-based min-conflicts on a row permutation: pick an attacked column, swap
+    # it with a random column when that lowers the diagonal conflicts. Returns the
+    # remaining conflicts (negated fitness); rows is updated in place.
+    n = len(rows)
+    offset = n - 1
+    diagonals = [0] * (2 * n - 1)
+    anti_diagonals = [0] * (2 * n - 1)
+    for col, row in enumerate(rows):
+        diagonals[row - col + offset] += 1
+        anti_diagonals[row + col] += 1
+    conflicts = sum(k * (k - 1) // 2 for k in diagonals) + sum(k * (k - 1) // 2 for k in anti_diagonals)
+
+    def attacked(col: int) -> bool:
+        row = rows[col]
+        return diagonals[row - col + offset] > 1 or anti_diagonals[row + col] > 1
+
+    def move(col: int, step: int) -> int:
+        # Adds or removes the queen of a column, returning the pairs it forms
+        row = rows[col]
+        d, a = row - col + offset, row + col
+        if step < 0:
+            diagonals[d] -= 1
+            anti_diagonals[a] -= 1
+        pairs = diagonals[d] + anti_diagonals[a]
+        if step > 0:
+            diagonals[d] += 1
+            anti_diagonals[a] += 1
+        return pairs
+
+    candidates = [col for col in range(n) if attacked(col)]
+    uniform = rng.random
+    steps = 0
+    while conflicts and candidates and steps < max_steps:
+        steps += 1
+        k = int(uniform() * len(candidates))
+        i = candidates[k]
+        if not attacked(i):
+            candidates[k] = candidates[-1]
+            candidates.pop()
+            continue
+
+        j = int(uniform() * n)
+        if i == j:
+            continue
+        delta = -move(i, -1) - move(j, -1)
+        rows[i], rows[j] = rows[j], rows[i]
+        delta += move(i, 1) + move(j, 1)
+        if delta < 0:
+            conflicts += delta
+            if attacked(j):
+                candidates.append(j)
+        else:
+            move(i, -1)
+            move(j, -1)
+            rows[i], rows[j] = rows[j], rows[i]
+            move(i, 1)
+            move(j, 1)
+    return conflicts
+
+# Crossover cores on row permutations (row of the queen in each column). They write
+# into child and take scratch buffers, which are handed back cleared, so callers can
+# reuse them; a value bitmap and a position index keep every operator O(N)
+def order_crossover_into(child, rows1, rows2, start: int, end: int, taken: bytearray):
+    # Copy segment from parent1
+    for i in range(start, end + 1):
+        child[i] = rows1[i]
+        taken[rows1[i]] = 1
+
+    # Fill remaining positions from parent2, keeping its order
+    i = 0 if start > 0 else end + 1
+    for row in rows2:
+        if taken[row]:
+            taken[row] = 0
+            continue
+        child[i] = row
+        i += 1
+        if i == start:
+            i = end + 1
+
+def pmx_crossover_into(child, rows1, rows2, start: int, end: int, taken: bytearray,
+                       position1: List[int]):
+    n = len(rows1)
+    for i in range(n):
+        position1[rows1[i]] = i
+    for i in range(start, end + 1):
+        child[i] = rows1[i]
+        taken[rows1[i]] = 1
+
+    # Follow the segment mapping until the value is free; the chains are
+    # disjoint, so the whole pass stays linear
+    for i in chain(range(start), range(end + 1, n)):
+        row = rows2[i]
+        while taken[row]:
+            row = rows2[position1[row]]
+        child[i] = row
+
+    for i in range(start, end + 1):
+        taken[rows1[i]] = 0
+
+def cycle_crossover_into(child, rows1, rows2, visited: bytearray, position1: List[int]):
+    n = len(rows1)
+    for i in range(n):
+        position1[rows1[i]] = i
+
+    # Cycles alternate between taking parent1's and parent2's rows
+    from_first = True
+    for start in range(n):
+        if visited[start]:
+            continue
+        source = rows1 if from_first else rows2
+        i = start
+        while not visited[i]:
+            visited[i] = 1
+            child[i] = source[i]
+            i = position1[rows2[i]]
+        from_first = not from_first
+
+    for i in range(n):
+        visited[i] = 0
+
+def new_figure(show: bool, figsize: Tuple[int, int]):
+    # pyplot only when a window is wanted; file-only output draws on an Agg canvas
+    if show:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=figsize)
+    FigureCanvasAgg(figure)
+    return figure
+
+def save_figure(figure, name: str, show: bool) -> str:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = os.path.join(OUTPUT_DIR, name)
+    figure.savefig(path)
+    if show:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return path
+
+class MetricsSink:
+    # Appends one row per generation to a CSV file, or JSONL when the name ends in .jsonl
+    def __init__(self, path: str, resume_after: Optional[int] = None):
+        self.path = path
+        self.jsonl = path.endswith(".jsonl")
+        if resume_after is not None and os.path.exists(path):
+            self._truncate(resume_after)
+        has_rows = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "a" if resume_after is not None else "w", newline="")
+        self.writer = None if self.jsonl else csv.writer(self.file)
+        if self.writer and not (resume_after is not None and has_rows):
+            self.writer.writerow(METRIC_FIELDS)
+
+    def _truncate(self, generation: int):
+        # Rows written after the checkpoint are replayed by the resumed run
+        temp = self.path + ".tmp"
+        with open(self.path, newline="") as src, open(temp, "w", newline="") as out:
+            if not self.jsonl:
+                out.write(next(src, ""))
+            for line in src:
+                if not line.strip():
+                    continue
+                row_generation = (json.loads(line)["generation"] if self.jsonl
+                                  else int(line.split(",", 1)[0]))
+                if row_generation > generation:
+                    break
+                out.write(line)
+        os.replace(temp, self.path)
+
+    def write(self, *values):
+        if self.jsonl:
+            self.file.write(json.dumps(dict(zip(METRIC_FIELDS, values))) + "\n")
+        else:
+            self.writer.writerow(values)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def read_metrics(path: str):
+    # Yields the rows of a metrics file one at a time, as dicts keyed by METRIC_FIELDS
+    with open(path, newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = ({k: float(v) for k, v in row.items()} for row in csv.DictReader(f))
+        for row in rows:
+            row["generation"] = int(row["generation"])
+            yield row
+
 class ChessBoard:
     def __init__(self, size: int):
         self.size = size
         self.queens: List[Queen] = []
         self.fitness = float('-inf')
+        # Occupancy counters behind the fitness, kept for O(1) swap updates
+        self.lines: Optional[Tuple[Counter, ...]] = None
+
+    @classmethod
+    def from_rows(cls, rows: List[int]) -> "ChessBoard":
+        board = cls(len(rows))
+        board.queens = [Queen(row, col) for col, row in enumerate(rows)]
+        return board
+
+    def rows(self) -> List[int]:
+        return [q.row for q in self.queens]
         
     def add_queen(self, row: int, col: int):
         self.queens.append(Queen(row, col))
+        self.lines = None
         
     def clear(self):
         self.queens.clear()
+        self.lines = None
         
     def calculate_fitness(self) -> float:
-        conflicts = 0
-        for i in range(len(self.queens)):
-            for j in range(i + 1, len(self.queens)):
-                q1, q2 = self.queens[i], self.queens[j]
-                if q1.row == q2.row or q1.col == q2.col or abs(q1.row - q2.row) == abs(q1.col - q2.col):
-                    conflicts += 1
+        # Pairs sharing a row, column, diagonal or anti-diagonal. Two queens on the
+        # same square share all four lines but count as one conflict.
+        rows, cols, diagonals, anti_diagonals, squares = self.lines = (
+            Counter(q.row for q in self.queens),
+            Counter(q.col for q in self.queens),
+            Counter(q.row - q.col for q in self.queens),
+            Counter(q.row + q.col for q in self.queens),
+            Counter((q.row, q.col) for q in self.queens),
+        )
+        conflicts = (conflict_pairs(rows) + conflict_pairs(cols) + conflict_pairs(diagonals)
+                     + conflict_pairs(anti_diagonals) - 3 * conflict_pairs(squares))
         self.fitness = -conflicts
         return self.fitness
 
+    def swap_rows(self, i: int, j: int):
+        q1, q2 = self.queens[i], self.queens[j]
+        if self.lines is None:
+            q1.row, q2.row = q2.row, q1.row
+            return
+
+        conflicts = -self.fitness
+        for q in (q1, q2):
+            conflicts -= self._move(q, -1)
+        q1.row, q2.row = q2.row, q1.row
+        for q in (q1, q2):
+            conflicts += self._move(q, 1)
+        self.fitness = -conflicts
+
+    def _move(self, queen: Queen, step: int) -> int:
+        # Adds (step=1) or removes (step=-1) a queen, returning the pairs it forms
+        keys = (queen.row, queen.col, queen.row - queen.col, queen.row + queen.col, (queen.row, queen.col))
+        if step < 0:
+            for counts, key in zip(self.lines, keys):
+                counts[key] -= 1
+        rows, cols, diagonals, anti_diagonals, squares = (
+            counts[key] for counts, key in zip(self.lines, keys))
+        if step > 0:
+            for counts, key in zip(self.lines, keys):
+                counts[key] += 1
+        return rows + cols + diagonals + anti_diagonals - 3 * squares
+
 class GeneticSolver:
     def __init__(self, board_size: int = 8, population_size: int = 100, 
                  max_generations: int = 1000, mutation_rate: float = 0.1,
-                 tournament_size: int = 3, elite_size: int = 2):
+                 tournament_size: int = 3, elite_size: int = 2, crossover: str = "order",
+                 checkpoint_path: Optional[str] = None, checkpoint_interval: int = 100,
+                 metrics_path: Optional[str] = None):
+        if crossover not in CROSSOVER_OPERATORS:
+            raise ValueError(f"Unknown crossover {crossover!r}, expected one of {list(CROSSOVER_OPERATORS)}")
         self.board_size = board_size
         self.population_size = population_size
         self.max_generations = max_generations
         self.mutation_rate = mutation_rate
         self.tournament_size = tournament_size
         self.elite_size = elite_size
+        self.crossover = crossover
         self.population: List[ChessBoard] = []
         self.best_solution: ChessBoard = None
         self.generation = 0
+        # Kept in memory only when no metrics file is streamed
         self.fitness_history: List[float] = []
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.metrics_path = metrics_path
+        self.metrics: Optional[MetricsSink] = None
         
     def initialize_population(self):
         self.population = []
@@ -62,101 +359,684 @@ class GeneticSolver:
         tournament = random.sample(self.population, self.tournament_size)
         return max(tournament, key=lambda x: x.fitness)
     
+    def recombine(self, parent1: ChessBoard, parent2: ChessBoard) -> ChessBoard:
+        return getattr(self, CROSSOVER_OPERATORS[self.crossover])(parent1, parent2)
+
     def order_crossover(self, parent1: ChessBoard, parent2: ChessBoard) -> ChessBoard:
-        child = ChessBoard(self.board_size)
         start, end = sorted(random.sample(range(self.board_size), 2))
-        
-        # Copy segment from parent1
-        for i in range(start, end + 1):
-            child.add_queen(parent1.queens[i].row, i)
-            
-        # Fill remaining positions from parent2
-        remaining = [q for q in parent2.queens if q not in child.queens]
-        for i in range(self.board_size):
-            if i < start or i > end:
-                child.add_queen(remaining.pop(0).row, i)
-                
-        return child
+        child = [0] * self.board_size
+        order_crossover_into(child, parent1.rows(), parent2.rows(), start, end,
+                             bytearray(self.board_size))
+        return ChessBoard.from_rows(child)
+
+    def pmx_crossover(self, parent1: ChessBoard, parent2: ChessBoard) -> ChessBoard:
+        start, end = sorted(random.sample(range(self.board_size), 2))
+        child = [0] * self.board_size
+        pmx_crossover_into(child, parent1.rows(), parent2.rows(), start, end,
+                           bytearray(self.board_size), [0] * self.board_size)
+        return ChessBoard.from_rows(child)
+
+    def cycle_crossover(self, parent1: ChessBoard, parent2: ChessBoard) -> ChessBoard:
+        child = [0] * self.board_size
+        cycle_crossover_into(child, parent1.rows(), parent2.rows(),
+                             bytearray(self.board_size), [0] * self.board_size)
+        return ChessBoard.from_rows(child)
     
     def mutate(self, board: ChessBoard):
         if random.random() < self.mutation_rate:
             i, j = random.sample(range(self.board_size), 2)
-            board.queens[i].row, board.queens[j].row = board.queens[j].row, board.queens[i].row
+            board.swap_rows(i, j)
             
-    def evolve(self):
-        self.initialize_population()
-        self.best_solution = max(self.population, key=lambda x: x.fitness)
+    def evolve(self, resume: bool = False):
+        if resume:
+            first = self.generation + 1
+        else:
+            self.initialize_population()
+            self.best_solution = max(self.population, key=lambda x: x.fitness)
+            first = 0
+        self.start_metrics(resume)
         
-        for generation in range(self.max_generations):
+        for generation in range(first, self.max_generations):
+            if self.best_solution.fitness == 0:
+                break
             self.generation = generation
+            started = time.perf_counter()
             new_population = []
             
             # Elitism
-            sorted_population = sorted(self.population, key=lambda x: x.fitness, reverse=True)
-            new_population.extend(sorted_population[:self.elite_size])
+            new_population.extend(heapq.nlargest(self.elite_size, self.population, key=attrgetter('fitness')))
             
             # Create rest of the population
             while len(new_population) < self.population_size:
                 parent1 = self.tournament_selection()
                 parent2 = self.tournament_selection()
-                child = self.order_crossover(parent1, parent2)
-                self.mutate(child)
+                child = self.recombine(parent1, parent2)
                 child.calculate_fitness()
+                self.mutate(child)
                 new_population.append(child)
             
             self.population = new_population
             current_best = max(self.population, key=lambda x: x.fitness)
             
             if current_best.fitness > self.best_solution.fitness:
-                self.best_solution = deepcopy(current_best)
+                self.best_solution = ChessBoard.from_rows(current_best.rows())
+                self.best_solution.fitness = current_best.fitness
                 
-            self.fitness_history.append(self.best_solution.fitness)
-            
-            if self.best_solution.fitness == 0:
-                break
+            self.record_generation(started)
                 
+        self.finish_run()
         return self.best_solution
+
+    def resume(self, path: Optional[str] = None):
+        self.load_checkpoint(path or self.checkpoint_path)
+        return self.evolve(resume=True)
+
+    # Engine hooks, so checkpointing and metrics work for ChessBoard and CompactBoard
+    # populations alike
+    def best_board(self):
+        return self.best_solution
+
+    def board_rows(self, board) -> List[int]:
+        return board.rows()
+
+    def restore_population(self, rows: array, best_rows: array, best_fitness: int):
+        n = self.board_size
+        self.population = []
+        for k in range(self.population_size):
+            board = ChessBoard.from_rows(rows[k * n:(k + 1) * n].tolist())
+            board.calculate_fitness()
+            self.population.append(board)
+        self.best_solution = ChessBoard.from_rows(best_rows.tolist())
+        self.best_solution.fitness = best_fitness
+
+    def start_metrics(self, resume: bool):
+        if self.metrics_path:
+            self.metrics = MetricsSink(self.metrics_path, self.generation if resume else None)
+
+    def record_generation(self, started: float):
+        elapsed = time.perf_counter() - started
+        best = self.best_board()
+        if self.metrics is None:
+            self.fitness_history.append(best.fitness)
+        else:
+            evaluations = self.population_size - min(self.elite_size, self.population_size)
+            mean = sum(board.fitness for board in self.population) / self.population_size
+            self.metrics.write(self.generation, best.fitness, mean, self.diversity(),
+                               evaluations / elapsed if elapsed > 0 else 0.0)
+
+        if self.checkpoint_path and (self.generation + 1) % self.checkpoint_interval == 0:
+            self.save_checkpoint(self.checkpoint_path)
+
+    def finish_run(self):
+        if self.checkpoint_path:
+            self.save_checkpoint(self.checkpoint_path)
+        if self.metrics is not None:
+            self.metrics.close()
+            self.metrics = None
+
+    def diversity(self) -> float:
+        # Mean fraction of columns where a board differs from the best one, over an
+        # evenly strided sample of the population
+        best_rows = self.board_rows(self.best_board())
+        step = max(1, self.population_size // DIVERSITY_SAMPLE)
+        sample = self.population[::step]
+        differing = sum(sum(a != b for a, b in zip(self.board_rows(board), best_rows)) for board in sample)
+        return differing / (len(sample) * self.board_size)
+
+    def save_checkpoint(self, path: str):
+        version, state, gauss = random.getstate()
+        best = self.best_board()
+        temp = path + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(CHECKPOINT_HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, self.board_size,
+                                           self.population_size, self.generation, best.fitness,
+                                           gauss is not None, gauss or 0.0))
+            # Fixed-width little-endian, so a checkpoint loads on any machine
+            np.asarray(state, dtype='<u4').tofile(f)
+            for board in self.population:
+                np.asarray(self.board_rows(board), dtype='<i4').tofile(f)
+            np.asarray(self.board_rows(best), dtype='<i4').tofile(f)
+        # Replace the old checkpoint only once the new one is complete
+        os.replace(temp, path)
+        if self.metrics is not None:
+            self.metrics.flush()
+
+    def load_checkpoint(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, board_size, population_size, generation, best_fitness, has_gauss, gauss = \
+                CHECKPOINT_HEADER.unpack(f.read(CHECKPOINT_HEADER.size))
+            if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+                raise ValueError(f"{path} is not a version {CHECKPOINT_VERSION} N-Queens checkpoint")
+            if (board_size, population_size) != (self.board_size, self.population_size):
+                raise ValueError(f"{path} holds {population_size} boards of size {board_size}, expected "
+                                 f"{self.population_size} of size {self.board_size}")
+            state = np.fromfile(f, dtype='<u4', count=625)
+            rows = array('i', np.fromfile(f, dtype='<i4', count=population_size * board_size).tolist())
+            best_rows = array('i', np.fromfile(f, dtype='<i4', count=board_size).tolist())
+            if len(state) != 625 or len(best_rows) != board_size:
+                raise ValueError(f"{path} is truncated")
+
+        random.setstate((3, tuple(state.tolist()), gauss if has_gauss else None))
+        self.generation = generation
+        self.restore_population(rows, best_rows, best_fitness)
     
-    def visualize_solution(self):
+    def visualize_solution(self, show: bool = True) -> Optional[str]:
         if not self.best_solution:
-            return
-            
-        plt.figure(figsize=(8, 8))
-        board = np.zeros((self.board_size, self.board_size))
-        board[1::2, ::2] = 1
-        board[::2, 1::2] = 1
-        
-        plt.imshow(board, cmap='binary')
-        
-        for queen in self.best_solution.queens:
-            plt.plot(queen.col, queen.row, 'ro', markersize=20)
-            
-        plt.xticks(range(self.board_size))
-        plt.yticks(range(self.board_size))
-        plt.grid(True)
-        plt.title(f'N-Queens Solution (Fitness: {self.best_solution.fitness})')
-        plt.savefig('output/queens_solution.png')
-        plt.show()
+            return None
+
+        n = self.board_size
+        queens = self.best_solution.queens
+        rows = np.fromiter((q.row for q in queens), dtype=np.int64, count=len(queens))
+        cols = np.fromiter((q.col for q in queens), dtype=np.int64, count=len(queens))
+        figure = new_figure(show, (8, 8))
+        ax = figure.add_subplot()
+        extent = (-0.5, n - 0.5, n - 0.5, -0.5)
+
+        if n <= BOARD_RENDER_LIMIT:
+            board = np.zeros((n, n))
+            board[1::2, ::2] = 1
+            board[::2, 1::2] = 1
+            ax.imshow(board, cmap='binary', extent=extent)
+            if n <= 16:
+                ax.set_xticks(range(n))
+                ax.set_yticks(range(n))
+                ax.grid(True)
+        else:
+            # Queens per block of a BOARD_RENDER_LIMIT x BOARD_RENDER_LIMIT grid
+            blocks = BOARD_RENDER_LIMIT
+            cells = (rows * blocks // n) * blocks + cols * blocks // n
+            density = np.bincount(cells, minlength=blocks * blocks).reshape(blocks, blocks)
+            ax.imshow(density, cmap='Greys', extent=extent, interpolation='nearest')
+
+        if n <= QUEEN_SCATTER_LIMIT:
+            # One collection for all queens, attacked ones in blue
+            attacked = np.zeros(len(queens), dtype=bool)
+            for keys in (rows, cols, rows - cols + n - 1, rows + cols):
+                attacked |= np.bincount(keys)[keys] > 1
+            size = min(400.0, (0.6 * 460 / n) ** 2)
+            ax.scatter(cols, rows, s=max(size, 0.5), c=np.where(attacked, 'tab:blue', 'red'),
+                       linewidths=0)
+
+        ax.set_title(f'N-Queens Solution (Fitness: {self.best_solution.fitness})')
+        return save_figure(figure, 'queens_solution.png', show)
         
-    def plot_fitness_history(self):
-        plt.figure(figsize=(10, 6))
-        plt.plot(self.fitness_history)
-        plt.title('Best Fitness Over Generations')
-        plt.xlabel('Generation')
-        plt.ylabel('Fitness')
-        plt.grid(True)
-        plt.savefig('output/fitness_history.png')
-        plt.show()
+    def plot_fitness_history(self, show: bool = True) -> str:
+        figure = new_figure(show, (10, 6))
+        ax = figure.add_subplot()
+        if self.metrics_path and os.path.exists(self.metrics_path):
+            rows = list(read_metrics(self.metrics_path))
+            ax.plot([row["generation"] for row in rows], [row["best"] for row in rows])
+        else:
+            ax.plot(self.fitness_history)
+        ax.set_title('Best Fitness Over Generations')
+        ax.set_xlabel('Generation')
+        ax.set_ylabel('Fitness')
+        ax.grid(True)
+        return save_figure(figure, 'fitness_history.png', show)
+
+class CompactBoard:
+    __slots__ = ("rows", "fitness")
+
+    def __init__(self, size: int):
+        self.rows = array('i', range(size))
+        self.fitness = float('-inf')
+
+    def copy_from(self, other: "CompactBoard"):
+        # Same-length slice assignment copies in place, without reallocating
+        self.rows[:] = other.rows
+        self.fitness = other.fitness
+
+    def calculate_fitness(self, diagonals: List[int], anti_diagonals: List[int]) -> int:
+        # Rows form a permutation, so only diagonals can clash; the zeroed scratch
+        # counters are cleared again on the way out
+        rows = self.rows
+        offset = len(rows) - 1
+        for col, row in enumerate(rows):
+            diagonals[row - col + offset] += 1
+            anti_diagonals[row + col] += 1
+        conflicts = 0
+        for col, row in enumerate(rows):
+            d, a = row - col + offset, row + col
+            k = diagonals[d]
+            conflicts += k * (k - 1) // 2
+            diagonals[d] = 0
+            k = anti_diagonals[a]
+            conflicts += k * (k - 1) // 2
+            anti_diagonals[a] = 0
+        self.fitness = -conflicts
+        return self.fitness
+
+class CompactGeneticSolver(GeneticSolver):
+    # Same GA on slotted array('i') boards: two population buffers are allocated once
+    # and swapped every generation, children are written into the spare buffer, and
+    # fitness and crossover use solver-owned scratch space
+    def __init__(self, board_size: int = 8, population_size: int = 100,
+                 max_generations: int = 1000, mutation_rate: float = 0.1,
+                 tournament_size: int = 3, elite_size: int = 2, crossover: str = "order",
+                 checkpoint_path: Optional[str] = None, checkpoint_interval: int = 100,
+                 metrics_path: Optional[str] = None):
+        super().__init__(board_size, population_size, max_generations, mutation_rate,
+                         tournament_size, elite_size, crossover, checkpoint_path,
+                         checkpoint_interval, metrics_path)
+        self.population = [CompactBoard(board_size) for _ in range(population_size)]
+        self.spare_population = [CompactBoard(board_size) for _ in range(population_size)]
+        self.best = CompactBoard(board_size)
+        self._diagonals = [0] * (2 * board_size - 1)
+        self._anti_diagonals = [0] * (2 * board_size - 1)
+        self._taken = bytearray(board_size)
+        self._position = [0] * board_size
+
+    def initialize_population(self):
+        for board in self.population:
+            random.shuffle(board.rows)
+            board.calculate_fitness(self._diagonals, self._anti_diagonals)
+
+    def tournament_selection(self) -> CompactBoard:
+        # Draws with replacement, so no sample list is built per tournament
+        population = self.population
+        best = population[random.randrange(self.population_size)]
+        for _ in range(self.tournament_size - 1):
+            entrant = population[random.randrange(self.population_size)]
+            if entrant.fitness > best.fitness:
+                best = entrant
+        return best
+
+    def breed(self, child: CompactBoard, parent1: CompactBoard, parent2: CompactBoard):
+        n = self.board_size
+        if self.crossover == "cycle":
+            cycle_crossover_into(child.rows, parent1.rows, parent2.rows, self._taken, self._position)
+        else:
+            start = random.randrange(n)
+            end = random.randrange(n - 1)
+            end += end >= start
+            start, end = min(start, end), max(start, end)
+            if self.crossover == "pmx":
+                pmx_crossover_into(child.rows, parent1.rows, parent2.rows, start, end,
+                                   self._taken, self._position)
+            else:
+                order_crossover_into(child.rows, parent1.rows, parent2.rows, start, end, self._taken)
+
+        if random.random() < self.mutation_rate:
+            i = random.randrange(n)
+            j = random.randrange(n - 1)
+            j += j >= i
+            child.rows[i], child.rows[j] = child.rows[j], child.rows[i]
+        child.calculate_fitness(self._diagonals, self._anti_diagonals)
+
+    def best_board(self) -> CompactBoard:
+        return self.best
+
+    def board_rows(self, board: CompactBoard) -> array:
+        return board.rows
+
+    def restore_population(self, rows: array, best_rows: array, best_fitness: int):
+        n = self.board_size
+        for k, board in enumerate(self.population):
+            board.rows[:] = rows[k * n:(k + 1) * n]
+            board.calculate_fitness(self._diagonals, self._anti_diagonals)
+        self.best.rows[:] = best_rows
+        self.best.fitness = best_fitness
+
+    def evolve(self, resume: bool = False):
+        if resume:
+            first = self.generation + 1
+        else:
+            self.initialize_population()
+            self.best.copy_from(max(self.population, key=attrgetter('fitness')))
+            first = 0
+        self.start_metrics(resume)
+        elite_size = min(self.elite_size, self.population_size)
+
+        for generation in range(first, self.max_generations):
+            if self.best.fitness == 0:
+                break
+            self.generation = generation
+            started = time.perf_counter()
+            spare = self.spare_population
+
+            # Elitism
+            elites = heapq.nlargest(elite_size, self.population, key=attrgetter('fitness'))
+            for slot, elite in zip(spare, elites):
+                slot.copy_from(elite)
+
+            # Create rest of the population in the spare buffer
+            for k in range(elite_size, self.population_size):
+                self.breed(spare[k], self.tournament_selection(), self.tournament_selection())
+
+            self.population, self.spare_population = spare, self.population
+            current_best = max(self.population, key=attrgetter('fitness'))
+            if current_best.fitness > self.best.fitness:
+                self.best.copy_from(current_best)
+
+            self.record_generation(started)
+
+        self.finish_run()
+        self.best_solution = ChessBoard.from_rows(self.best.rows.tolist())
+        self.best_solution.fitness = self.best.fitness
+        return self.best_solution
+
+class VectorizedGeneticSolver(GeneticSolver):
+    # Same GA on a (population_size, board_size) array: row k holds the queen row of
+    # every column of board k, so each board is a permutation and operators run batched
+    def __init__(self, board_size: int = 8, population_size: int = 100,
+                 max_generations: int = 1000, mutation_rate: float = 0.1,
+                 tournament_size: int = 3, elite_size: int = 2, seed: Optional[int] = None):
+        # Crossover is always the batched order crossover
+        super().__init__(board_size, population_size, max_generations, mutation_rate,
+                         tournament_size, elite_size)
+        self.rng = np.random.default_rng(seed)
+        self.population_fitness = None
+        self.best_rows = None
+        self.best_fitness = float('-inf')
+
+    def initialize_population(self):
+        rows = np.tile(np.arange(self.board_size), (self.population_size, 1))
+        self.population = self.rng.permuted(rows, axis=1)
+        self.population_fitness = self.batch_fitness(self.population)
+        self._track_best()
+
+    def _track_best(self):
+        current_best = int(np.argmax(self.population_fitness))
+        if self.population_fitness[current_best] > self.best_fitness:
+            self.best_fitness = int(self.population_fitness[current_best])
+            self.best_rows = self.population[current_best].copy()
+
+    def top(self, count: int):
+        best = np.argpartition(-self.population_fitness, count - 1)[:count]
+        return self.population[best]
+
+    def immigrate(self, rows):
+        # Migrants replace the worst boards
+        worst = np.argpartition(self.population_fitness, len(rows) - 1)[:len(rows)]
+        self.population[worst] = rows
+        self.population_fitness[worst] = self.batch_fitness(rows)
+        self._track_best()
+
+    def batch_fitness(self, boards):
+        n_boards, n = boards.shape
+        cols = np.arange(n)
+        board_ids = np.arange(n_boards)[:, None]
+
+        def pairs(keys, size):
+            counts = np.bincount((keys + board_ids * size).ravel(), minlength=n_boards * size)
+            counts = counts.reshape(n_boards, size)
+            return (counts * (counts - 1) // 2).sum(axis=1)
+
+        # Columns are distinct by construction, so rows and both diagonals are enough
+        conflicts = pairs(boards, n) + pairs(boards - cols + n - 1, 2 * n - 1) + pairs(boards + cols, 2 * n - 1)
+        return -conflicts
+
+    def batch_tournament_selection(self, n_winners: int):
+        entrants = self.rng.integers(0, self.population_size, size=(n_winners, self.tournament_size))
+        best = np.argmax(self.population_fitness[entrants], axis=1)
+        return entrants[np.arange(n_winners), best]
+
+    def batch_order_crossover(self, parents1, parents2):
+        n_children, n = parents1.shape
+        children_ids = np.arange(n_children)[:, None]
+        cols = np.arange(n)
+        start = self.rng.integers(0, n, n_children)
+        end = (start + self.rng.integers(1, n, n_children)) % n
+        start, end = np.minimum(start, end), np.maximum(start, end)
+        in_segment = (cols >= start[:, None]) & (cols <= end[:, None])
+
+        # Values copied from parent1's segment, indexed by value
+        taken = np.zeros((n_children, n), dtype=bool)
+        taken[children_ids, parents1] = in_segment
+        keep = ~taken[children_ids, parents2]
+
+        # Parent2's remaining values, in order, fill the positions outside the segment in order
+        fill_values = parents2[children_ids, np.argsort(~keep, axis=1, kind='stable')]
+        fill_positions = np.argsort(in_segment, axis=1, kind='stable')
+        n_fill = n - (end - start + 1)
+        fill = cols < n_fill[:, None]
+
+        children = np.where(in_segment, parents1, 0)
+        children[np.nonzero(fill)[0], fill_positions[fill]] = fill_values[fill]
+        return children
+
+    def batch_mutate(self, boards):
+        mutated = np.nonzero(self.rng.random(len(boards)) < self.mutation_rate)[0]
+        i = self.rng.integers(0, self.board_size, len(mutated))
+        j = (i + self.rng.integers(1, self.board_size, len(mutated))) % self.board_size
+        swapped = boards[mutated, i]
+        boards[mutated, i] = boards[mutated, j]
+        boards[mutated, j] = swapped
+
+    def to_board(self, rows, fitness: Optional[int] = None) -> ChessBoard:
+        board = ChessBoard.from_rows(rows.tolist())
+        if fitness is None:
+            board.calculate_fitness()
+        else:
+            board.fitness = fitness
+        return board
+
+    def step(self):
+        elite_size = min(self.elite_size, self.population_size)
+        n_children = self.population_size - elite_size
+
+        # Elitism
+        elite = np.argpartition(-self.population_fitness, elite_size - 1)[:elite_size] if elite_size else []
+
+        # Create rest of the population
+        parents1 = self.population[self.batch_tournament_selection(n_children)]
+        parents2 = self.population[self.batch_tournament_selection(n_children)]
+        children = self.batch_order_crossover(parents1, parents2)
+        self.batch_mutate(children)
+
+        self.population = np.concatenate([self.population[elite], children])
+        self.population_fitness = np.concatenate([self.population_fitness[elite],
+                                                  self.batch_fitness(children)])
+        self._track_best()
+
+    def evolve(self):
+        self.initialize_population()
+
+        for generation in range(self.max_generations):
+            self.generation = generation
+            self.step()
+            self.fitness_history.append(self.best_fitness)
+
+            if self.best_fitness == 0:
+                break
+
+        self.best_solution = self.to_board(self.best_rows, self.best_fitness)
+        return self.best_solution
+
+class MemeticGeneticSolver(VectorizedGeneticSolver):
+    # Hybrid GA for very large boards: greedy initial boards, the usual batched
+    # selection, crossover, mutation and elitism, then a min-conflicts repair of
+    # the elites (or of every child) each generation
+    def __init__(self, board_size: int = 8, population_size: int = 100,
+                 max_generations: int = 1000, mutation_rate: float = 0.1,
+                 tournament_size: int = 3, elite_size: int = 2, seed: Optional[int] = None,
+                 repair: str = "elites", repair_steps: Optional[int] = None):
+        if repair not in ("elites", "children"):
+            raise ValueError(f"Unknown repair target {repair!r}, expected 'elites' or 'children'")
+        super().__init__(board_size, population_size, max_generations, mutation_rate,
+                         tournament_size, elite_size, seed)
+        self.repair = repair
+        self.repair_steps = repair_steps or 10 * board_size
+        self.local_rng = random.Random(int(self.rng.integers(2 ** 63)))
+
+    def initialize_population(self):
+        # Greedy boards are slow to build in pure Python, so only the boards
+        # that become the first elites are greedy and the rest are random
+        super().initialize_population()
+        n_greedy = min(max(self.elite_size, 1), self.population_size)
+        for index in range(n_greedy):
+            self.population[index] = greedy_rows(self.board_size, self.local_rng)
+        self.population_fitness[:n_greedy] = self.batch_fitness(self.population[:n_greedy])
+        self._track_best()
+
+    def step(self):
+        super().step()
+        # Elites sit at the front of the population after a step
+        elite_size = min(self.elite_size, self.population_size)
+        targets = range(elite_size) if self.repair == "elites" else range(elite_size, self.population_size)
+        for index in targets:
+            rows = self.population[index].tolist()
+            self.population_fitness[index] = -min_conflicts_repair(rows, self.repair_steps, self.local_rng)
+            self.population[index] = np.array(rows)
+        self._track_best()
+
+def _run_island(index: int, config: dict, seed, migration_interval: int, migrants: int,
+                channel, solved, best_rows, best_fitness, history, generations, barrier):
+    # One island: evolves on its own and swaps its top boards with its ring
+    # neighbours through the shared migration channel every migration_interval generations
+    from threading import BrokenBarrierError
+
+    solver = VectorizedGeneticSolver(seed=seed, **config)
+    n = solver.board_size
+    n_islands = len(best_fitness)
+    outbox = np.frombuffer(channel.get_obj(), dtype=np.int32).reshape(n_islands, migrants, n)
+    history = np.frombuffer(history.get_obj(), dtype=np.int64).reshape(n_islands, -1)
+
+    def publish():
+        best_rows[index * n:(index + 1) * n] = solver.best_rows.tolist()
+        best_fitness[index] = solver.best_fitness
+
+    solver.initialize_population()
+    try:
+        for generation in range(solver.max_generations):
+            if solved.value:
+                break
+            solver.step()
+            history[index, generation] = solver.best_fitness
+            generations[index] = generation
+
+            if solver.best_fitness == 0:
+                solved.value = 1
+                publish()
+                barrier.abort()
+                return
+
+            if (generation + 1) % migration_interval == 0:
+                outbox[index] = solver.top(migrants)
+                barrier.wait()
+                solver.immigrate(outbox[(index - 1) % n_islands].copy())
+                barrier.wait()
+    except BrokenBarrierError:
+        pass
+    publish()
+
+class IslandGeneticSolver(GeneticSolver):
+    # K VectorizedGeneticSolver islands in separate processes, exchanging their top
+    # boards around a ring; the run stops as soon as any island solves the board
+    def __init__(self, board_size: int = 8, population_size: int = 100,
+                 max_generations: int = 1000, mutation_rate: float = 0.1,
+                 tournament_size: int = 3, elite_size: int = 2, n_islands: Optional[int] = None,
+                 migration_interval: int = 20, migrants: int = 2, seed: Optional[int] = None):
+        super().__init__(board_size, population_size, max_generations, mutation_rate,
+                         tournament_size, elite_size)
+        self.n_islands = n_islands or os.cpu_count() or 1
+        self.migration_interval = migration_interval
+        self.migrants = min(migrants, population_size)
+        self.seed = seed
+        self.solved_by: Optional[int] = None
+
+    def evolve(self):
+        context = multiprocessing.get_context()
+        k, n = self.n_islands, self.board_size
+        channel = context.Array('i', k * self.migrants * n)
+        solved = context.Value('b', 0, lock=False)
+        best_rows = context.Array('i', k * n, lock=False)
+        # Worse than any real fitness, so islands that stopped early do not mask the others
+        worst = -(n * n)
+        best_fitness = context.Array('q', [worst] * k, lock=False)
+        # 64-bit like best_fitness: -(n * n) and real fitness values overflow int32 on big boards
+        history = context.Array('q', [worst] * (k * self.max_generations))
+        generations = context.Array('i', k, lock=False)
+        barrier = context.Barrier(k)
+
+        config = dict(board_size=n, population_size=self.population_size,
+                      max_generations=self.max_generations, mutation_rate=self.mutation_rate,
+                      tournament_size=self.tournament_size, elite_size=self.elite_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(k)
+        islands = [context.Process(target=_run_island,
+                                   args=(i, config, seeds[i], self.migration_interval, self.migrants,
+                                         channel, solved, best_rows, best_fitness, history,
+                                         generations, barrier))
+                   for i in range(k)]
+        for island in islands:
+            island.start()
+        for island in islands:
+            island.join()
+
+        best = max(range(k), key=lambda i: best_fitness[i])
+        self.solved_by = best if best_fitness[best] == 0 else None
+        self.generation = generations[best] if self.solved_by is not None else max(generations)
+        island_history = np.frombuffer(history.get_obj(), dtype=np.int64).reshape(k, -1)
+        best_so_far = np.maximum.accumulate(island_history.max(axis=0))
+        self.fitness_history = best_so_far[:self.generation + 1].tolist()
+        self.best_solution = ChessBoard.from_rows(list(best_rows[best * n:(best + 1) * n]))
+        self.best_solution.calculate_fitness()
+        return self.best_solution
 
 def main():
-    solver = GeneticSolver(board_size=8, population_size=100, max_generations=1000)
-    solution = solver.evolve()
+    parser = argparse.ArgumentParser(description="N-Queens genetic algorithm")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="skip the plots and the matplotlib import")
+    parser.add_argument("--save-only", action="store_true",
+                        help="write the plots to output/ without opening a window")
+    parser.add_argument("--board-size", type=int, default=8)
+    parser.add_argument("--population-size", type=int, default=100,
+                        help=f"boards per generation; the memetic engine caps this at "
+                             f"{MEMETIC_MAX_CELLS:,} queens in total (10 boards at a million queens)")
+    parser.add_argument("--max-generations", type=int, default=1000)
+    parser.add_argument("--engine", choices=["boards", "compact", "numpy", "islands", "memetic"],
+                        default="boards",
+                        help="ChessBoard objects, reusable array-backed boards, the batched NumPy population, "
+                             "NumPy islands in parallel processes, or the NumPy population with "
+                             "min-conflicts repair")
+    parser.add_argument("--islands", type=int, help="number of islands (default: CPU count)")
+    parser.add_argument("--migration-interval", type=int, default=20)
+    parser.add_argument("--crossover", choices=list(CROSSOVER_OPERATORS), default="order",
+                        help="crossover operator for the boards and compact engines")
+    parser.add_argument("--checkpoint", help="save the run state to this file (boards and compact engines)")
+    parser.add_argument("--checkpoint-interval", type=int, default=100, help="generations between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue the run saved in --checkpoint")
+    parser.add_argument("--metrics", help="stream per-generation metrics to this .csv or .jsonl file")
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume needs --checkpoint")
+    if (args.checkpoint or args.metrics) and args.engine not in ("boards", "compact"):
+        parser.error("--checkpoint and --metrics are only supported by the boards and compact engines")
+    run_options = dict(checkpoint_path=args.checkpoint, checkpoint_interval=args.checkpoint_interval,
+                       metrics_path=args.metrics)
+
+    if args.engine == "islands":
+        solver = IslandGeneticSolver(board_size=args.board_size, population_size=args.population_size,
+                                     max_generations=args.max_generations, n_islands=args.islands,
+                                     migration_interval=args.migration_interval)
+    elif args.engine == "memetic":
+        # Every batched step touches the whole population, so huge boards get few of them
+        population_size = min(args.population_size, max(2, MEMETIC_MAX_CELLS // args.board_size))
+        if population_size < args.population_size:
+            print(f"Memetic population capped at {population_size} boards for {args.board_size} queens")
+        solver = MemeticGeneticSolver(board_size=args.board_size, population_size=population_size,
+                                      max_generations=args.max_generations)
+    elif args.engine == "numpy":
+        solver = VectorizedGeneticSolver(board_size=args.board_size, population_size=args.population_size,
+                                         max_generations=args.max_generations)
+    elif args.engine == "compact":
+        solver = CompactGeneticSolver(board_size=args.board_size, population_size=args.population_size,
+                                      max_generations=args.max_generations, crossover=args.crossover,
+                                      **run_options)
+    else:
+        solver = GeneticSolver(board_size=args.board_size, population_size=args.population_size,
+                               max_generations=args.max_generations, crossover=args.crossover,
+                               **run_options)
+    solution = solver.resume() if args.resume else solver.evolve()
     
     print(f"\nSolution found in generation {solver.generation}")
     print(f"Final fitness: {solution.fitness}")
     
-    solver.visualize_solution()
-    solver.plot_fitness_history()
+    if not args.no_plot:
+        for path in (solver.visualize_solution(show=not args.save_only),
+                     solver.plot_fitness_history(show=not args.save_only)):
+            if path:
+                print(f"Saved {path}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,9 +1,28 @@
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import messagebox, ttk
-import networkx as nx
 import random
-import matplotlib.pyplot as plt
-from typing import List, Dict, Optional, Tuple
+import heapq
+import sys
+import queue
+import threading
+import argparse
+import csv
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from array import array
+from collections import OrderedDict
+from itertools import groupby
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Set, Tuple
+
+# networkx and matplotlib cost hundreds of milliseconds to import, so they are
+# only imported where a graph object or a plot is actually needed
+if TYPE_CHECKING:
+    import networkx as nx
+    from matplotlib.figure import Figure
 
 NODE_TYPES = {
     "Building": ["A Building", "B Building", "E Building", "F Building", "I Building", "J Building"],
@@ -23,19 +42,927 @@ MIN_CONNECTIONS = 2
 MAX_CONNECTIONS = 3
 MIN_COST = 1
 MAX_COST = 10
+MAX_GENERATION_ATTEMPTS = 50
+PARTNER_ATTEMPTS = 32
+ROUTING_METHODS = ("dijkstra", "astar", "bidirectional")
+INF = float('inf')
+POLL_INTERVAL_MS = 50
+BATCH_COLUMNS = ["role", "map_id", "seed", "destination", "destination_type", "cost", "path_length"]
+BATCH_CHUNK_SIZE = 50
+TARGET_TREE_CACHE_SIZE = 8  # trees kept for k-shortest-path destinations
+
+# Map file: header, type and node name tables, then 8-byte aligned little-endian
+# node type runs (int64 code/length pairs), CSR offsets and targets (int32) and
+# edge costs (float64)
+PATHWAY_MAGIC = b"PPWY"
+PATHWAY_FORMAT_VERSION = 1
+PATHWAY_HEADER = struct.Struct("<4sIQQQQQ")
+
+
+def flatten_nodes(node_types: Dict[str, List[str]]) -> List[str]:
+    return [node for nodes in node_types.values() for node in nodes]
+
+
+def scale_node_types(n_nodes: int) -> Dict[str, List[str]]:
+    if n_nodes < len(NODE_TYPES):
+        raise ValueError(f"A map needs at least {len(NODE_TYPES)} nodes, got {n_nodes}")
+
+    # Keep the proportions of the hand-made 13-node map
+    base_total = sum(len(nodes) for node_type, nodes in NODE_TYPES.items() if node_type != "Home")
+    remaining = n_nodes - 1
+    node_types: Dict[str, List[str]] = {}
+    for node_type, nodes in NODE_TYPES.items():
+        if node_type == "Home":
+            continue
+        count = max(1, remaining * len(nodes) // base_total)
+        node_types[node_type] = [f"{node_type} {i + 1}" for i in range(count)]
+
+    # Rounding leftovers go to the first type
+    first_type = next(iter(node_types))
+    shortfall = remaining - sum(len(nodes) for nodes in node_types.values())
+    start = len(node_types[first_type])
+    node_types[first_type].extend(f"{first_type} {start + i + 1}" for i in range(shortfall))
+    node_types["Home"] = ["Home Node"]
+    return node_types
+
+
+class _NodePool:
+    # Set of integer node ids with O(1) add, remove and random choice
+    def __init__(self, size: int):
+        self.items: List[int] = []
+        self.position = [-1] * size
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, node: int) -> bool:
+        return self.position[node] != -1
+
+    def add(self, node: int):
+        if self.position[node] == -1:
+            self.position[node] = len(self.items)
+            self.items.append(node)
+
+    def remove(self, node: int):
+        index = self.position[node]
+        if index == -1:
+            return
+        last = self.items.pop()
+        if last != node:
+            self.items[index] = last
+            self.position[last] = index
+        self.position[node] = -1
+
+    def choice(self, rng: random.Random) -> int:
+        return self.items[rng.randrange(len(self.items))]
+
+
+class PathwayGenerator:
+    def __init__(self, min_connections: int = MIN_CONNECTIONS, max_connections: int = MAX_CONNECTIONS,
+                 min_cost: int = MIN_COST, max_cost: int = MAX_COST,
+                 max_attempts: int = MAX_GENERATION_ATTEMPTS, seed: Optional[int] = None):
+        if max_connections < 2 or min_connections > max_connections:
+            raise ValueError("Connections per node must satisfy min <= max and max >= 2")
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.min_cost = min_cost
+        self.max_cost = max_cost
+        self.max_attempts = max_attempts
+        self.rng = random.Random(seed)
+
+    def generate_edges(self, nodes: List[str], root: str = "Home Node") -> List[Tuple[str, str]]:
+        if len(nodes) <= self.min_connections:
+            raise ValueError(f"Need more than {self.min_connections} nodes to give each "
+                             f"node {self.min_connections} connections")
+        for _ in range(self.max_attempts):
+            edges = self._try_generate(nodes, root)
+            if edges is not None:
+                return edges
+        raise RuntimeError(f"Could not generate a graph with {self.min_connections}-"
+                           f"{self.max_connections} connections per node "
+                           f"after {self.max_attempts} attempts")
+
+    def generate_costs(self, n_edges: int) -> List[int]:
+        return [self.rng.randint(self.min_cost, self.max_cost) for _ in range(n_edges)]
+
+    def generate_graph(self, nodes: List[str], root: str = "Home Node") -> nx.Graph:
+        import networkx as nx
+        edges = self.generate_edges(nodes, root)
+        costs = self.generate_costs(len(edges))
+
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_edges_from((u, v, {'cost': cost}) for (u, v), cost in zip(edges, costs))
+        return G
+
+    def _try_generate(self, nodes: List[str], root: str) -> Optional[List[Tuple[str, str]]]:
+        n = len(nodes)
+        degree = [0] * n
+        neighbors = [set() for _ in range(n)]
+        edges: List[Tuple[str, str]] = []
+        open_nodes = _NodePool(n)
+        needy_nodes = _NodePool(n)
+
+        def connect(u: int, v: int):
+            edges.append((nodes[u], nodes[v]))
+            neighbors[u].add(v)
+            neighbors[v].add(u)
+            for x in (u, v):
+                degree[x] += 1
+                if degree[x] >= self.max_connections:
+                    open_nodes.remove(x)
+                if degree[x] >= self.min_connections:
+                    needy_nodes.remove(x)
+
+        # Random spanning tree grown from the root keeps the graph connected
+        order = list(range(n))
+        root_id = nodes.index(root)
+        order[0], order[root_id] = order[root_id], order[0]
+        rest = order[1:]
+        self.rng.shuffle(rest)
+
+        open_nodes.add(root_id)
+        for node in rest:
+            connect(open_nodes.choice(self.rng), node)
+            if degree[node] < self.max_connections:
+                open_nodes.add(node)
+
+        # Top up nodes below the minimum, pairing them with each other first
+        for node in range(n):
+            if degree[node] < self.min_connections:
+                needy_nodes.add(node)
+
+        while needy_nodes:
+            node = needy_nodes.choice(self.rng)
+            partner = self._find_partner(node, needy_nodes, open_nodes, neighbors)
+            if partner is None:
+                return None
+            connect(node, partner)
+
+        return edges
+
+    def _find_partner(self, node: int, needy_nodes: _NodePool, open_nodes: _NodePool,
+                      neighbors: List[set]) -> Optional[int]:
+        for pool in (needy_nodes, open_nodes):
+            if len(pool) < 2:
+                continue
+            for _ in range(PARTNER_ATTEMPTS):
+                other = pool.choice(self.rng)
+                if other != node and other not in neighbors[node]:
+                    return other
+        return None
+
+
+class ShortestPathTree:
+    # Single-source distances and predecessors; any destination is a predecessor walk
+    def __init__(self, engine: "RoutingEngine", source: int, dist: List[float], pred: List[int]):
+        self.engine = engine
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+
+    def distance_to(self, target: str) -> float:
+        return self.dist[self.engine._node_id(target)]
+
+    def path_to(self, target: str) -> Tuple[List[str], float]:
+        t = self.engine._node_id(target)
+        if self.dist[t] == INF:
+            import networkx as nx
+            raise nx.NetworkXNoPath(f"No path between {self.engine.nodes[self.source]} and {target}.")
+        return [self.engine.nodes[u] for u in RoutingEngine._walk(self.pred, t)], self.dist[t]
+
+
+class RoutingEngine:
+    # Graph compiled to CSR arrays: the neighbors of node u are
+    # targets[offsets[u]:offsets[u + 1]], with matching edge costs
+    def __init__(self, nodes: List[str], offsets: Sequence[int], targets: Sequence[int],
+                 costs: Sequence[float]):
+        self.nodes = nodes
+        self._node_index: Optional[Dict[str, int]] = None
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self._trees: Dict[int, ShortestPathTree] = {}
+        self._target_trees: "OrderedDict[int, ShortestPathTree]" = OrderedDict()
+
+    @property
+    def node_index(self) -> Dict[str, int]:
+        # Built on first lookup so memory-mapped maps open without touching every node
+        if self._node_index is None:
+            self._node_index = {node: i for i, node in enumerate(self.nodes)}
+        return self._node_index
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph, weight: str = 'cost') -> "RoutingEngine":
+        nodes = list(G.nodes)
+        node_index = {node: i for i, node in enumerate(nodes)}
+        offsets = array('i', [0])
+        targets = array('i')
+        costs = array('d')
+        for node in nodes:
+            for neighbor, data in G.adj[node].items():
+                targets.append(node_index[neighbor])
+                costs.append(data.get(weight, 1))
+            offsets.append(len(targets))
+        return cls(nodes, offsets, targets, costs)
+
+    @classmethod
+    def from_edges(cls, nodes: List[str], edges: List[Tuple[str, str]],
+                   costs: Sequence[float]) -> "RoutingEngine":
+        # Counting sort of both edge directions, without building a networkx graph
+        node_index = {node: i for i, node in enumerate(nodes)}
+        ends = [(node_index[u], node_index[v]) for u, v in edges]
+        offsets = array('i', [0]) * (len(nodes) + 1)
+        for u, v in ends:
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for i in range(len(nodes)):
+            offsets[i + 1] += offsets[i]
+
+        fill = offsets[:-1]
+        targets = array('i', [0]) * offsets[-1]
+        edge_costs = array('d', [0]) * offsets[-1]
+        for (u, v), cost in zip(ends, costs):
+            for a, b in ((u, v), (v, u)):
+                targets[fill[a]] = b
+                edge_costs[fill[a]] = cost
+                fill[a] += 1
+
+        engine = cls(nodes, offsets, targets, edge_costs)
+        engine._node_index = node_index
+        return engine
+
+    def to_graph(self, weight: str = 'cost') -> nx.Graph:
+        import networkx as nx
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes)
+        for u in range(len(self.nodes)):
+            for e in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.targets[e]
+                if u < v and self.costs[e] != INF:
+                    G.add_edge(self.nodes[u], self.nodes[v], **{weight: self.costs[e]})
+        return G
+
+    def shortest_path(self, source: str, target: str, method: str = "dijkstra",
+                      heuristic: Optional[Callable[[str, str], float]] = None) -> Tuple[List[str], float]:
+        if method not in ROUTING_METHODS:
+            raise ValueError(f"Unknown routing method {method!r}, expected one of {ROUTING_METHODS}")
+        s, t = self._node_id(source), self._node_id(target)
+
+        if s == t:
+            return [source], 0
+        if method == "bidirectional":
+            ids, cost = self._bidirectional(s, t)
+        elif method == "astar" and heuristic is not None:
+            target_name = self.nodes[t]
+            ids, cost = self._astar(s, t, lambda u: heuristic(self.nodes[u], target_name))
+        else:
+            ids, cost = self._astar(s, t, None)
+
+        if ids is None:
+            import networkx as nx
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return [self.nodes[u] for u in ids], cost
+
+    def shortest_path_tree(self, source: str) -> ShortestPathTree:
+        s = self._node_id(source)
+        if s not in self._trees:
+            dist, pred = self.single_source(source)
+            self._trees[s] = ShortestPathTree(self, s, dist, pred)
+        return self._trees[s]
+
+    def k_shortest_paths(self, source: str, target: str, k: int, avoid: Iterable[str] = (),
+                         disjoint: bool = False) -> List[Tuple[List[str], float]]:
+        s, t = self._node_id(source), self._node_id(target)
+        blocked_nodes = {self._node_id(node) for node in avoid}
+        if s in blocked_nodes or t in blocked_nodes:
+            raise ValueError("The source and target cannot be avoided")
+        if k <= 0:
+            return []
+
+        if disjoint:
+            paths = self._disjoint_paths(s, t, k, blocked_nodes)
+        else:
+            paths = self._yen_paths(s, t, k, blocked_nodes, self._target_tree(t))
+        if not paths:
+            import networkx as nx
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        return [([self.nodes[u] for u in ids], cost) for cost, ids in paths]
+
+    def _target_tree(self, t: int) -> ShortestPathTree:
+        # Destination trees live in a small LRU cache that edge updates drop instead
+        # of repairing, so querying many destinations does not grow every update
+        if t in self._trees:
+            return self._trees[t]
+        tree = self._target_trees.pop(t, None)
+        if tree is None:
+            dist, pred = self.single_source(self.nodes[t])
+            tree = ShortestPathTree(self, t, dist, pred)
+        self._target_trees[t] = tree
+        if len(self._target_trees) > TARGET_TREE_CACHE_SIZE:
+            self._target_trees.popitem(last=False)
+        return tree
+
+    def _yen_paths(self, s: int, t: int, k: int, blocked_nodes: Set[int],
+                   to_target: ShortestPathTree) -> List[Tuple[float, List[int]]]:
+        # Yen's loopless k-shortest paths. Every spur search runs towards the target,
+        # so the tree rooted at the target is an exact A* heuristic and, when its
+        # branch is still open, the spur path itself.
+        first = self._spur_path(s, t, blocked_nodes, set(), to_target)
+        if first is None:
+            return []
+        paths = [first]
+        candidates: List[Tuple[float, List[int]]] = []
+        seen = {tuple(first[1])}
+        while len(paths) < k:
+            _, previous = paths[-1]
+            root_cost = 0
+            for i in range(len(previous) - 1):
+                spur, root = previous[i], previous[:i + 1]
+                spur_blocked_edges = {(spur, path[i + 1]) for _, path in paths
+                                      if len(path) > i + 1 and path[:i + 1] == root}
+                spur_blocked_nodes = blocked_nodes.union(root[:-1])
+                found = self._spur_path(spur, t, spur_blocked_nodes, spur_blocked_edges, to_target)
+                if found is not None:
+                    candidate = root[:-1] + found[1]
+                    if tuple(candidate) not in seen:
+                        seen.add(tuple(candidate))
+                        heapq.heappush(candidates, (root_cost + found[0], candidate))
+                root_cost += self.costs[self._edge_slot(previous[i], previous[i + 1])]
+            if not candidates:
+                break
+            paths.append(heapq.heappop(candidates))
+        return paths
+
+    def single_source(self, source: str) -> Tuple[List[float], List[int]]:
+        s = self._node_id(source)
+        dist = [INF] * len(self.nodes)
+        pred = [-1] * len(self.nodes)
+        dist[s] = 0
+        self._settle([(0, s)], dist, pred)
+        return dist, pred
+
+    def update_edge_cost(self, u: str, v: str, cost: float):
+        # A removed edge keeps its CSR slots with infinite cost
+        a, b = self._node_id(u), self._node_id(v)
+        forward, backward = self._edge_slot(a, b), self._edge_slot(b, a)
+        old_cost = self.costs[forward]
+        if cost == old_cost:
+            return
+        self.costs[forward] = cost
+        self.costs[backward] = cost
+
+        self._target_trees.clear()
+        for tree in self._trees.values():
+            if cost < old_cost:
+                self._repair_decrease(tree, a, b, cost)
+            else:
+                self._repair_increase(tree, a, b)
+
+    def remove_edge(self, u: str, v: str):
+        self.update_edge_cost(u, v, INF)
+
+    def _edge_slot(self, u: int, v: int) -> int:
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            if self.targets[e] == v:
+                return e
+        import networkx as nx
+        raise nx.NetworkXError(f"The edge {self.nodes[u]}-{self.nodes[v]} is not in the graph.")
+
+    def _repair_decrease(self, tree: ShortestPathTree, a: int, b: int, cost: float):
+        # Only nodes whose distance improves through the cheaper edge are touched
+        dist, pred = tree.dist, tree.pred
+        heap = []
+        for x, y in ((a, b), (b, a)):
+            if dist[x] + cost < dist[y]:
+                dist[y] = dist[x] + cost
+                pred[y] = x
+                heap.append((dist[y], y))
+        self._settle(heap, dist, pred)
+
+    def _repair_increase(self, tree: ShortestPathTree, a: int, b: int):
+        dist, pred = tree.dist, tree.pred
+        if pred[b] == a:
+            root = b
+        elif pred[a] == b:
+            root = a
+        else:
+            return
+
+        # Collect the subtree hanging below the changed tree edge
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        subtree = [root]
+        in_subtree = {root}
+        for x in subtree:
+            for e in range(offsets[x], offsets[x + 1]):
+                y = targets[e]
+                if pred[y] == x and y not in in_subtree:
+                    in_subtree.add(y)
+                    subtree.append(y)
+        for x in subtree:
+            dist[x] = INF
+            pred[x] = -1
+
+        # Reattach each subtree node through its best neighbor outside it
+        heap = []
+        for x in subtree:
+            for e in range(offsets[x], offsets[x + 1]):
+                y = targets[e]
+                if y not in in_subtree and dist[y] + costs[e] < dist[x]:
+                    dist[x] = dist[y] + costs[e]
+                    pred[x] = y
+            if dist[x] < INF:
+                heap.append((dist[x], x))
+        heapq.heapify(heap)
+        self._settle(heap, dist, pred)
+
+    def _settle(self, heap: List[Tuple[float, int]], dist: List[float], pred: List[int]):
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = d + costs[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+    def _node_id(self, node: str) -> int:
+        try:
+            return self.node_index[node]
+        except KeyError:
+            import networkx as nx
+            raise nx.NodeNotFound(f"Node {node} is not in the graph.") from None
+
+    def _astar(self, s: int, t: int,
+               estimate: Optional[Callable[[int], float]]) -> Tuple[Optional[List[int]], float]:
+        # Without an estimate this is plain Dijkstra stopped at the target
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        dist = {s: 0}
+        pred = {s: -1}
+        heap = [(0, 0, s)]
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == t:
+                return self._walk(pred, t), d
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                nd = d + costs[e]
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd + estimate(v) if estimate else nd, nd, v))
+        return None, INF
+
+    def _spur_path(self, s: int, t: int, blocked_nodes: Set[int], blocked_edges: Set[Tuple[int, int]],
+                   to_target: ShortestPathTree) -> Optional[Tuple[float, List[int]]]:
+        remaining = to_target.dist
+        if remaining[s] == INF:
+            return None
+
+        # The target tree branch from s is optimal whenever nothing on it is blocked
+        path = [s]
+        u = s
+        while u != t:
+            v = to_target.pred[u]
+            if v in blocked_nodes or (u, v) in blocked_edges:
+                break
+            path.append(v)
+            u = v
+        else:
+            return remaining[s], path
+
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        dist = {s: 0}
+        pred = {s: -1}
+        heap = [(remaining[s], 0, s)]
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == t:
+                return d, self._walk(pred, t)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v in blocked_nodes or (u, v) in blocked_edges or remaining[v] == INF:
+                    continue
+                nd = d + costs[e]
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    pred[v] = u
+                    heapq.heappush(heap, (nd + remaining[v], nd, v))
+        return None
+
+    def _disjoint_paths(self, s: int, t: int, k: int,
+                        blocked_nodes: Set[int]) -> List[Tuple[float, List[int]]]:
+        # Bhandari/Suurballe: successive shortest paths on the residual graph, where
+        # an edge already used u->v can only be walked back v->u at negative cost,
+        # which reroutes the earlier path. Johnson potentials keep every search a
+        # plain Dijkstra. The result has the lowest total cost for its path count.
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        used: Set[Tuple[int, int]] = set()
+        potential = [0.0] * len(self.nodes)
+        n_paths = 0
+        while n_paths < k:
+            dist = {s: 0}
+            pred = {s: -1}
+            heap = [(0, s)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if costs[e] == INF or v in blocked_nodes or (u, v) in used:
+                        continue
+                    cost = -costs[e] if (v, u) in used else costs[e]
+                    nd = d + cost + potential[u] - potential[v]
+                    if nd < dist.get(v, INF):
+                        dist[v] = nd
+                        pred[v] = u
+                        heapq.heappush(heap, (nd, v))
+            if t not in dist:
+                break
+            # Nodes not reached now stay unreachable, so their potentials never matter again
+            for u, d in dist.items():
+                potential[u] += d
+            v = t
+            while v != s:
+                u = pred[v]
+                if (v, u) in used:
+                    used.remove((v, u))
+                else:
+                    used.add((u, v))
+                v = u
+            n_paths += 1
+
+        # Split the used edges into paths, cutting out any zero-cost loops
+        successors: Dict[int, List[int]] = {}
+        for u, v in used:
+            successors.setdefault(u, []).append(v)
+        paths = []
+        for _ in range(n_paths):
+            path = [s]
+            position = {s: 0}
+            while path[-1] != t:
+                v = successors[path[-1]].pop()
+                if v in position:
+                    del path[position[v] + 1:]
+                    position = {u: i for i, u in enumerate(path)}
+                else:
+                    position[v] = len(path)
+                    path.append(v)
+            cost = sum(self.costs[self._edge_slot(u, v)] for u, v in zip(path, path[1:]))
+            paths.append((cost, path))
+        paths.sort()
+        return paths
+
+    def _bidirectional(self, s: int, t: int) -> Tuple[Optional[List[int]], float]:
+        offsets, targets, costs = self.offsets, self.targets, self.costs
+        dist = ({s: 0}, {t: 0})
+        pred = ({s: -1}, {t: -1})
+        heaps = ([(0, s)], [(0, t)])
+        best, meet = INF, -1
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            side_dist, other_dist = dist[side], dist[1 - side]
+            d, u = heapq.heappop(heaps[side])
+            if d > side_dist[u]:
+                continue
+            for e in range(offsets[u], offsets[u + 1]):
+                # Removed edges keep their slot with infinite cost
+                if costs[e] == INF:
+                    continue
+                v = targets[e]
+                nd = d + costs[e]
+                if nd < side_dist.get(v, INF):
+                    side_dist[v] = nd
+                    pred[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+                if v in other_dist and side_dist[v] + other_dist[v] < best:
+                    best, meet = side_dist[v] + other_dist[v], v
+
+        if meet == -1:
+            return None, INF
+        forward = self._walk(pred[0], meet)
+        backward = self._walk(pred[1], meet)
+        return forward + backward[-2::-1], best
+
+    @staticmethod
+    def _walk(pred, node: int) -> List[int]:
+        path = []
+        while node != -1:
+            path.append(node)
+            node = pred[node]
+        path.reverse()
+        return path
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def save_pathway(filename: str, engine: RoutingEngine, node_types: Dict[str, List[str]]):
+    type_names = list(node_types)
+    type_of = {node: i for i, nodes in enumerate(node_types.values()) for node in nodes}
+    type_blob = "\n".join(type_names).encode()
+    name_blob = "\n".join(engine.nodes).encode()
+    # Generated maps list nodes grouped by type, so this is a handful of runs
+    type_runs = array('q')
+    for code, run in groupby(type_of[node] for node in engine.nodes):
+        type_runs.extend((code, sum(1 for _ in run)))
+    arrays = [type_runs, array('i', engine.offsets), array('i', engine.targets),
+              array('d', engine.costs)]
+    if sys.byteorder != "little":
+        for values in arrays:
+            values.byteswap()
+
+    with open(filename, 'wb') as f:
+        f.write(PATHWAY_HEADER.pack(PATHWAY_MAGIC, PATHWAY_FORMAT_VERSION, len(engine.nodes),
+                                    len(engine.targets), len(type_blob), len(name_blob),
+                                    len(type_runs) // 2))
+        for blob in (type_blob, name_blob, *(values.tobytes() for values in arrays)):
+            f.write(blob)
+            f.write(_padding(f.tell()))
+
+
+def load_pathway(filename: str) -> Tuple[RoutingEngine, Dict[str, List[str]]]:
+    # The CSR arrays are copy-on-write views of the mapped file, so processes loading
+    # the same map share its pages until they change an edge cost
+    with open(filename, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, n_nodes, n_slots, type_bytes, name_bytes, n_runs = PATHWAY_HEADER.unpack_from(mapped)
+    if magic != PATHWAY_MAGIC:
+        raise ValueError(f"{filename} is not a pathway map file")
+    if version != PATHWAY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported pathway map version {version}")
+    if sys.byteorder != "little":
+        raise ValueError("Pathway map files can only be memory-mapped on little-endian machines")
+
+    view = memoryview(mapped)
+    position = PATHWAY_HEADER.size
+
+    def take(size: int) -> memoryview:
+        nonlocal position
+        chunk = view[position:position + size]
+        position += size + (-(position + size) % 8)
+        return chunk
+
+    type_names = bytes(take(type_bytes)).decode().split("\n")
+    nodes = bytes(take(name_bytes)).decode().split("\n") if n_nodes else []
+    type_runs = take(16 * n_runs).cast('q')
+    offsets = take(4 * (n_nodes + 1)).cast('i')
+    targets = take(4 * n_slots).cast('i')
+    costs = take(8 * n_slots).cast('d')
+
+    node_types: Dict[str, List[str]] = {name: [] for name in type_names}
+    start = 0
+    for i in range(0, len(type_runs), 2):
+        code, length = type_runs[i], type_runs[i + 1]
+        node_types[type_names[code]].extend(nodes[start:start + length])
+        start += length
+    return RoutingEngine(nodes, offsets, targets, costs), node_types
+
+
+class PathwayRenderer:
+    # The layout is computed once per graph; only the highlighted path is redrawn per query
+    def __init__(self, G: nx.Graph, headless: bool = False, figsize: Tuple[int, int] = (12, 8)):
+        self.G = G
+        self.headless = headless
+        self.figsize = figsize
+        self.figure: Optional[Figure] = None
+        self.ax = None
+        self._pos: Optional[Dict[str, Tuple[float, float]]] = None
+        self._path_artist = None
+
+    @property
+    def pos(self) -> Dict[str, Tuple[float, float]]:
+        if self._pos is None:
+            import networkx as nx
+            self._pos = nx.spring_layout(self.G, k=1, iterations=50)
+        return self._pos
+
+    def invalidate(self):
+        # Edges or costs changed: redraw the base figure but keep the layout
+        if self.figure is not None and not self.headless:
+            import matplotlib.pyplot as plt
+            plt.close(self.figure)
+        self.figure = None
+
+    def draw_route(self, path: List[str], title: str) -> Figure:
+        import networkx as nx
+        if not self._figure_alive():
+            self._draw_base()
+        if self._path_artist is not None:
+            self._path_artist.remove()
+            self._path_artist = None
+
+        path_edges = list(zip(path, path[1:]))
+        if path_edges:
+            self._path_artist = nx.draw_networkx_edges(self.G, self.pos, edgelist=path_edges,
+                                                       edge_color='blue', width=3, ax=self.ax)
+        self.ax.set_title(title)
+        return self.figure
+
+    def save(self, filename: str):
+        self.figure.savefig(filename)
+
+    def show(self):
+        import matplotlib.pyplot as plt
+        self.figure.canvas.draw_idle()
+        plt.show(block=False)
+
+    def _figure_alive(self) -> bool:
+        if self.figure is None:
+            return False
+        if self.headless:
+            return True
+        import matplotlib.pyplot as plt
+        return plt.fignum_exists(self.figure.number)
+
+    def _draw_base(self):
+        import networkx as nx
+        if self.headless:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self.figure = Figure(figsize=self.figsize)
+            FigureCanvasAgg(self.figure)
+        else:
+            import matplotlib.pyplot as plt
+            self.figure = plt.figure(figsize=self.figsize)
+        self.ax = self.figure.add_subplot()
+        self._path_artist = None
+
+        nx.draw_networkx_nodes(self.G, self.pos, node_color='lightgray',
+                               node_size=700, ax=self.ax)
+        nx.draw_networkx_edges(self.G, self.pos, edge_color='gray', width=1, ax=self.ax)
+        nx.draw_networkx_labels(self.G, self.pos, font_weight='bold', ax=self.ax)
+
+        edge_labels = {(u, v): f"{d['cost']:g}" for u, v, d in self.G.edges(data=True)}
+        nx.draw_networkx_edge_labels(self.G, self.pos, edge_labels=edge_labels,
+                                     font_color='red', font_size=8, ax=self.ax)
+        self.ax.axis('off')
+
+
+def route_title(role: Optional[str]) -> str:
+    return (f"Perfect Pathway - {role}'s Route\n"
+            f"Selected path shown in blue, costs shown in red")
+
+
+def save_route_image(G: nx.Graph, path: List[str], filename: str, role: Optional[str] = None,
+                     renderer: Optional[PathwayRenderer] = None) -> PathwayRenderer:
+    # Off-screen PNG through the Agg canvas; pass the renderer back in to reuse its layout
+    if renderer is None:
+        renderer = PathwayRenderer(G, headless=True)
+    renderer.draw_route(path, route_title(role))
+    renderer.save(filename)
+    return renderer
+
+
+def simulate_map(role: str, map_id: int, seed: int, n_nodes: Optional[int] = None) -> List[tuple]:
+    # One random map, routed from the Home Node to every destination
+    node_types = NODE_TYPES if n_nodes is None else scale_node_types(n_nodes)
+    nodes = flatten_nodes(node_types)
+    generator = PathwayGenerator(seed=seed)
+    edges = generator.generate_edges(nodes)
+    router = RoutingEngine.from_edges(nodes, edges, generator.generate_costs(len(edges)))
+    tree = router.shortest_path_tree("Home Node")
+
+    rows = []
+    for node_type, nodes in node_types.items():
+        if node_type == "Home":
+            continue
+        for node in nodes:
+            path, cost = tree.path_to(node)
+            rows.append((role, map_id, seed, node, node_type, cost, len(path) - 1))
+    return rows
+
+
+def _simulate_chunk(tasks: List[Tuple[str, int, int]], n_nodes: Optional[int]) -> List[tuple]:
+    return [row for role, map_id, seed in tasks for row in simulate_map(role, map_id, seed, n_nodes)]
+
+
+class _CsvSink:
+    def __init__(self, filename: str):
+        self.file = open(filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(BATCH_COLUMNS)
+
+    def write(self, rows: List[tuple]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetSink:
+    # One row group per finished chunk, so results stream to disk
+    def __init__(self, filename: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+        self.pa = pa
+        self.schema = pa.schema([("role", pa.string()), ("map_id", pa.int64()), ("seed", pa.int64()),
+                                 ("destination", pa.string()), ("destination_type", pa.string()),
+                                 ("cost", pa.float64()), ("path_length", pa.int64())])
+        self.writer = pq.ParquetWriter(filename, self.schema)
+
+    def write(self, rows: List[tuple]):
+        columns = list(zip(*rows)) if rows else [[] for _ in BATCH_COLUMNS]
+        self.writer.write_table(self.pa.table(dict(zip(BATCH_COLUMNS, columns)), schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class BatchSimulator:
+    def __init__(self, n_maps: int = 1000, roles: Sequence[str] = ROLES, n_nodes: Optional[int] = None,
+                 workers: Optional[int] = None, chunk_size: int = BATCH_CHUNK_SIZE,
+                 seed: Optional[int] = None):
+        self.n_maps = n_maps
+        self.roles = list(roles)
+        self.n_nodes = n_nodes
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def tasks(self) -> Iterator[Tuple[str, int, int]]:
+        # Seeds are drawn up front so results do not depend on the worker count
+        rng = random.Random(self.seed)
+        for role in self.roles:
+            for map_id in range(self.n_maps):
+                yield role, map_id, rng.getrandbits(63)
+
+    def run(self, output: Optional[str] = None) -> Dict[Tuple[str, str], Dict[str, float]]:
+        tasks = list(self.tasks())
+        chunks = [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+        sink = None
+        if output is not None:
+            sink = _ParquetSink(output) if output.endswith(".parquet") else _CsvSink(output)
+        totals: Dict[Tuple[str, str], List[float]] = {}
+
+        def consume(rows: List[tuple]):
+            if sink is not None:
+                sink.write(rows)
+            for role, _, _, _, node_type, cost, path_length in rows:
+                total = totals.setdefault((role, node_type), [0, 0.0, 0])
+                total[0] += 1
+                total[1] += cost
+                total[2] += path_length
+
+        try:
+            if self.workers == 1:
+                for chunk in chunks:
+                    consume(_simulate_chunk(chunk, self.n_nodes))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    futures = [pool.submit(_simulate_chunk, chunk, self.n_nodes) for chunk in chunks]
+                    for future in as_completed(futures):
+                        consume(future.result())
+        finally:
+            if sink is not None:
+                sink.close()
+
+        return {key: {"count": count, "mean_cost": cost / count, "mean_path_length": length / count}
+                for key, (count, cost, length) in sorted(totals.items())}
+
+
+class TaskCancelled(Exception):
+    pass
+
 
 class PerfectPathway:
-    def __init__(self):
+    def __init__(self, plot: bool = True):
         self.root = tk.Tk()
         self.root.title(WINDOW_TITLE)
         self.root.geometry(WINDOW_SIZE)
         
         self.G: Optional[nx.Graph] = None
+        self.router: Optional[RoutingEngine] = None
+        self.renderer: Optional[PathwayRenderer] = None
         self.home_node = "Home Node"
         self.destination_node: Optional[str] = None
         self.selected_role: Optional[str] = None
+        self.generator = PathwayGenerator()
+        self.plot = plot
+
+        # Worker results come back through this queue, drained by poll_tasks on the Tk loop
+        self.tasks: queue.Queue = queue.Queue()
+        self.job_id = 0
+        self.cancel_event = threading.Event()
         
         self.setup_ui()
+        self.root.after(POLL_INTERVAL_MS, self.poll_tasks)
         
     def setup_ui(self):
         main_frame = ttk.Frame(self.root, padding="20")
@@ -75,6 +1002,16 @@ class PerfectPathway:
         self.sim_button = ttk.Button(main_frame, text="Start Simulation",
                                    command=self.start_simulation)
         self.sim_button.pack(pady=10)
+
+        status_frame = ttk.Frame(main_frame)
+        status_frame.pack(fill=tk.X, pady=5)
+        self.status_label = ttk.Label(status_frame, text="Ready", font=NORMAL_FONT)
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        self.progress = ttk.Progressbar(status_frame, mode='indeterminate', length=200)
+        self.progress.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_task,
+                                        state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
         
         exit_button = ttk.Button(main_frame, text="Exit", command=self.root.destroy)
         exit_button.pack(pady=10)
@@ -82,66 +1019,120 @@ class PerfectPathway:
     def choose_role(self, role: str):
         self.selected_role = role
         self.role_label.config(text=f"Role selected: {role}")
-        self.initialize_army_graph()
+        self.run_in_background("Generating map...", self.build_graph, self.apply_graph,
+                               "Failed to initialize graph")
+
+    def run_in_background(self, description: str, work: Callable, on_done: Callable,
+                          error_title: str = "An error occurred"):
+        # Starting a new job supersedes the running one; its result is dropped
+        self.cancel_event.set()
+        self.cancel_event = threading.Event()
+        self.job_id += 1
+        job, cancel_event = self.job_id, self.cancel_event
+
+        def report(message: str):
+            if cancel_event.is_set():
+                raise TaskCancelled()
+            self.tasks.put((job, "progress", message))
+
+        def target():
+            try:
+                self.tasks.put((job, "done", (on_done, work(report))))
+            except TaskCancelled:
+                pass
+            except Exception as e:
+                self.tasks.put((job, "error", f"{error_title}: {str(e)}"))
+
+        self.set_busy(description)
+        threading.Thread(target=target, daemon=True).start()
+
+    def poll_tasks(self):
+        # Reschedule even if a callback raises; Tk still reports the exception
+        try:
+            while True:
+                try:
+                    job, kind, payload = self.tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if job != self.job_id:
+                    continue
+                if kind == "progress":
+                    self.status_label.config(text=payload)
+                elif kind == "done":
+                    self.set_idle("Ready")
+                    on_done, result = payload
+                    on_done(result)
+                else:
+                    self.set_idle("Failed")
+                    messagebox.showerror("Error", payload)
+        finally:
+            self.root.after(POLL_INTERVAL_MS, self.poll_tasks)
+
+    def cancel_task(self):
+        self.cancel_event.set()
+        self.job_id += 1
+        self.set_idle("Cancelled")
+
+    def set_busy(self, message: str):
+        self.status_label.config(text=message)
+        self.progress.start(10)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.sim_button.config(state=tk.DISABLED)
+
+    def set_idle(self, message: str):
+        self.status_label.config(text=message)
+        self.progress.stop()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.sim_button.config(state=tk.NORMAL)
 
     def get_node_connections(self, node: str, edges: List[Tuple[str, str]]) -> int:
         return sum(1 for edge in edges if node in edge)
 
     def generate_random_connections(self) -> List[Tuple[str, str]]:
-        all_nodes = [node for nodes in NODE_TYPES.values() for node in nodes]
-        edges = []
-        connected_nodes = {self.home_node}
-        
-        unconnected_nodes = set(all_nodes) - connected_nodes
-        while unconnected_nodes:
-            node = random.choice(list(unconnected_nodes))
-            available_connected = [n for n in connected_nodes 
-                                if self.get_node_connections(n, edges) < MAX_CONNECTIONS]
-            if not available_connected:
-                return self.generate_random_connections()
-            connected_to = random.choice(available_connected)
-            edges.append((connected_to, node))
-            connected_nodes.add(node)
-            unconnected_nodes.remove(node)
-        
-        for node in all_nodes:
-            current_connections = self.get_node_connections(node, edges)
-            if current_connections < MIN_CONNECTIONS:
-                attempts = 0
-                while current_connections < MIN_CONNECTIONS and attempts < 100:
-                    other_node = random.choice(all_nodes)
-                    if (other_node != node and 
-                        self.get_node_connections(other_node, edges) < MAX_CONNECTIONS and
-                        (node, other_node) not in edges and 
-                        (other_node, node) not in edges):
-                        edges.append((node, other_node))
-                        current_connections += 1
-                    attempts += 1
-                
-                if current_connections < MIN_CONNECTIONS:
-                    return self.generate_random_connections()
-        
-        return edges
+        return self.generator.generate_edges(flatten_nodes(NODE_TYPES), self.home_node)
+
+    def build_graph(self, report: Callable[[str], None]) -> Tuple[nx.Graph, RoutingEngine, PathwayRenderer]:
+        G = self.generator.generate_graph(flatten_nodes(NODE_TYPES), self.home_node)
+        report("Compiling routes...")
+        router = RoutingEngine.from_graph(G)
+        router.shortest_path_tree(self.home_node)
+        report("Computing layout...")
+        renderer = PathwayRenderer(G)
+        if self.plot:
+            renderer.pos  # warm the layout cache off the Tk thread
+        return G, router, renderer
+
+    def apply_graph(self, built: Tuple[nx.Graph, RoutingEngine, PathwayRenderer]):
+        if self.renderer is not None:
+            self.renderer.invalidate()
+        self.G, self.router, self.renderer = built
 
     def initialize_army_graph(self):
         try:
-            self.G = nx.Graph()
-            all_nodes = [node for nodes in NODE_TYPES.values() for node in nodes]
-            self.G.add_nodes_from(all_nodes)
-            
-            edges = self.generate_random_connections()
-            
-            for edge in edges:
-                self.G.add_edge(edge[0], edge[1], cost=random.randint(MIN_COST, MAX_COST))
-                
-            if not nx.is_connected(self.G):
-                messagebox.showwarning("Warning", "Generated graph is not fully connected. Regenerating...")
-                self.initialize_army_graph()
-                return
-                
+            self.apply_graph(self.build_graph(lambda message: None))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to initialize graph: {str(e)}")
 
+    def save_map(self, filename: str):
+        save_pathway(filename, self.router, NODE_TYPES)
+
+    def load_map(self, filename: str):
+        router, _ = load_pathway(filename)
+        G = router.to_graph()
+        self.apply_graph((G, router, PathwayRenderer(G)))
+
+    def update_edge_cost(self, u: str, v: str, cost: float):
+        # The router rejects pairs that were never adjacent; an edge dropped by
+        # remove_edge keeps its router slot, so it is restored in G as well
+        self.router.update_edge_cost(u, v, cost)
+        self.G.add_edge(u, v, cost=cost)
+        self.renderer.invalidate()
+
+    def remove_edge(self, u: str, v: str):
+        self.G.remove_edge(u, v)
+        self.router.remove_edge(u, v)
+        self.renderer.invalidate()
+
     def select_destination(self, node: str):
         self.destination_node = node
         self.destination_label.config(text=f"Destination selected: {node}")
@@ -155,50 +1146,68 @@ class PerfectPathway:
             messagebox.showwarning("Error", "Please select a destination node.")
             return
 
+        router, renderer = self.router, self.renderer
+        home_node, destination_node = self.home_node, self.destination_node
+
+        def route(report: Callable[[str], None]) -> Optional[Tuple[List[str], float]]:
+            import networkx as nx
+            try:
+                path, total_cost = router.shortest_path_tree(home_node).path_to(destination_node)
+            except nx.NetworkXNoPath:
+                return None
+            if self.plot:
+                report("Computing layout...")
+                renderer.pos  # warm the layout cache off the Tk thread
+            return path, total_cost
+
+        self.run_in_background("Finding route...", route, self.show_route)
+
+    def show_route(self, routed: Optional[Tuple[List[str], float]]):
+        if routed is None:
+            messagebox.showerror("Error", "No valid path found to the destination!")
+            return
+        path, total_cost = routed
+
         try:
-            path = nx.shortest_path(self.G, source=self.home_node,
-                                  target=self.destination_node, weight='cost')
-            
-            result_message = f"{self.selected_role} is going to {self.destination_node} "
+            result_message = f"{self.selected_role} is going to {path[-1]} "
             result_message += f"through the following path: {' -> '.join(path)}\n"
-            
-            total_cost = sum(self.G[path[i]][path[i+1]]['cost'] 
-                           for i in range(len(path)-1))
-            result_message += f"Total Cost/Injuries: {total_cost}"
+            result_message += f"Total Cost/Injuries: {total_cost:g}"
 
-            plt.figure(figsize=(12, 8))
-            pos = nx.spring_layout(self.G, k=1, iterations=50)
-            
-            nx.draw_networkx_nodes(self.G, pos, node_color='lightgray',
-                                 node_size=700)
-            
-            nx.draw_networkx_edges(self.G, pos, edge_color='gray', width=1)
-            
-            path_edges = [(path[i], path[i+1]) for i in range(len(path)-1)]
-            nx.draw_networkx_edges(self.G, pos, edgelist=path_edges,
-                                 edge_color='blue', width=3)
-            
-            nx.draw_networkx_labels(self.G, pos, font_weight='bold')
-            
-            edge_labels = {(u, v): d['cost'] for u, v, d in self.G.edges(data=True)}
-            nx.draw_networkx_edge_labels(self.G, pos, edge_labels=edge_labels,
-                                       font_color='red', font_size=8)
-            
-            plt.title(f"Perfect Pathway - {self.selected_role}'s Route\n"
-                     f"Selected path shown in blue, costs shown in red")
-            plt.axis('off')
-            plt.show()
+            if self.plot:
+                self.renderer.draw_route(path, route_title(self.selected_role))
+                self.renderer.show()
 
             messagebox.showinfo("Simulation Result", result_message)
             
-        except nx.NetworkXNoPath:
-            messagebox.showerror("Error", "No valid path found to the destination!")
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
     def run(self):
         self.root.mainloop()
 
+def main():
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument("--batch", type=int, metavar="N_MAPS",
+                        help="run N_MAPS random maps per role headless instead of the GUI")
+    parser.add_argument("--nodes", type=int, help="nodes per generated map (default: the 12-node map)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, help="base seed for reproducible batches")
+    parser.add_argument("--output", help="stream per-route rows to a .csv or .parquet file")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="report routes as text only, without importing matplotlib")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        app = PerfectPathway(plot=not args.no_plot)
+        app.run()
+        return
+
+    simulator = BatchSimulator(n_maps=args.batch, n_nodes=args.nodes, workers=args.workers, seed=args.seed)
+    summary = simulator.run(args.output)
+    print(f"{'Role':<10} {'Destination':<12} {'Routes':>8} {'Mean cost':>10} {'Mean hops':>10}")
+    for (role, node_type), stats in summary.items():
+        print(f"{role:<10} {node_type:<12} {stats['count']:>8} "
+              f"{stats['mean_cost']:>10.2f} {stats['mean_path_length']:>10.2f}")
+
 if __name__ == "__main__":
-    app = PerfectPathway()
-    app.run()
+    main()
@@ -0,0 +1,70 @@
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Every routing method has to agree after edges are removed and restored; run
+# this after touching the routing engine
+HERE = Path(__file__).resolve().parent
+SCRIPT = HERE / "Project " / "Perfect_pathway.py"
+NODES = ["s", "a", "b", "t"]
+EDGES = [("s", "a"), ("a", "t"), ("s", "b"), ("b", "t")]
+COSTS = [1, 1, 5, 5]
+
+
+def load_module():
+    spec = importlib.util.spec_from_file_location("perfect_pathway", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def check(module, router, stage: str, expected: tuple) -> bool:
+    ok = True
+    for method in module.ROUTING_METHODS:
+        try:
+            path, cost = router.shortest_path("s", "t", method=method)
+            result = ("-".join(path), cost)
+        except Exception as e:
+            result = (type(e).__name__, str(e))
+        status = "ok" if result == expected else "FAIL"
+        print(f"{status:<5} {stage:<10} {method:<14} {result[0]} {result[1]}")
+        ok = ok and result == expected
+    return ok
+
+
+def check_app_update(module) -> bool:
+    # The app's graph must only change once the router accepted the edge; the
+    # window itself is never built, only the state update_edge_cost touches
+    router = module.RoutingEngine.from_edges(NODES, EDGES, COSTS)
+    app = module.PerfectPathway.__new__(module.PerfectPathway)
+    app.G, app.router, app.renderer = router.to_graph(), router, SimpleNamespace(invalidate=lambda: None)
+    try:
+        app.update_edge_cost("s", "t", 1)
+    except Exception:
+        pass
+    app.remove_edge("a", "t")
+    app.update_edge_cost("a", "t", 1)
+
+    ok = True
+    for u, v, expected in (("s", "t", False), ("a", "t", True)):
+        result = app.G.has_edge(u, v)
+        status = "ok" if result == expected else "FAIL"
+        print(f"{status:<5} {'app':<10} {u + '-' + v:<14} in graph: {result}")
+        ok = ok and result == expected
+    return ok
+
+
+def main():
+    module = load_module()
+    router = module.RoutingEngine.from_edges(NODES, EDGES, COSTS)
+    ok = check(module, router, "initial", ("s-a-t", 2))
+    router.remove_edge("a", "t")
+    ok = check(module, router, "removed", ("s-b-t", 10)) and ok
+    router.update_edge_cost("a", "t", 1)
+    ok = check(module, router, "restored", ("s-a-t", 2)) and ok
+    ok = check_app_update(module) and ok
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
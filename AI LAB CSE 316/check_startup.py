@@ -0,0 +1,59 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Importing a lab script must not pull in the plotting stack, and has to stay
+# within the time budget; run this after touching any top-level imports
+HERE = Path(__file__).resolve().parent
+SCRIPTS = [
+    HERE / "Project " / "Perfect_pathway.py",
+    HERE / "Lab Report" / "Lab Report 5" / "genetic.py",
+    HERE / "Lab Report" / "Lab Report 4" / "k-means.py",
+]
+HEAVY_MODULES = ["matplotlib", "networkx"]
+IMPORT_BUDGET_MS = 300
+REPEATS = 3
+
+PROBE = """
+import importlib.util, json, sys, time
+spec = importlib.util.spec_from_file_location("probe", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+start = time.perf_counter()
+spec.loader.exec_module(module)
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({"ms": elapsed, "heavy": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+
+def measure(script: Path) -> dict:
+    # Fresh interpreter per run so nothing is already imported; keep the fastest run
+    runs = []
+    for _ in range(REPEATS):
+        output = subprocess.run([sys.executable, "-c", PROBE, str(script), *HEAVY_MODULES],
+                                capture_output=True, text=True, check=True, cwd=script.parent)
+        runs.append(json.loads(output.stdout))
+    return min(runs, key=lambda run: run["ms"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time budget check for the lab scripts")
+    parser.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="budget in milliseconds")
+    args = parser.parse_args()
+
+    failed = False
+    for script in SCRIPTS:
+        result = measure(script)
+        problems = []
+        if result["heavy"]:
+            problems.append(f"imports {', '.join(result['heavy'])}")
+        if result["ms"] > args.budget:
+            problems.append(f"over the {args.budget:.0f} ms budget")
+        status = "FAIL" if problems else "ok"
+        print(f"{status:<5} {script.name:<20} {result['ms']:7.1f} ms  {'; '.join(problems)}")
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()